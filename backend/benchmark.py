@@ -0,0 +1,215 @@
+"""
+Benchmark script for MyVision backend - measures the detection pipeline in-process
+
+Usage:
+    python benchmark.py annotation --image street.jpg --runs 20
+    python benchmark.py backends --image street.jpg --backends pytorch onnx onnx:int8 openvino
+    python benchmark.py scene --objects 5 20 100
+"""
+import argparse
+import json
+import os
+import time
+
+import cv2
+import numpy as np
+
+from main import (
+    MOVING_OBJECTS, STATIC_OBJECTS, Detections, ModelManager, SceneAnalysis, box_iou, build_gemini_prompt,
+    decode_image, model_manager, run_image_detection, scene_signature, template_voice_description
+)
+
+def load_image_bytes(image_path: str = None) -> bytes:
+    """Read an image file, or build a synthetic 1280x720 JPEG when no path is given"""
+    if image_path:
+        with open(image_path, 'rb') as f:
+            return f.read()
+
+    rng = np.random.default_rng(0)
+    image = (rng.random((720, 1280, 3)) * 255).astype(np.uint8)
+    _, buffer = cv2.imencode('.jpg', image)
+    return buffer.tobytes()
+
+def time_call(func, runs: int, warmup: int = 2):
+    """Run func warmup + runs times and return the timed runs in milliseconds"""
+    for _ in range(warmup):
+        func()
+
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return timings
+
+def summarize(timings):
+    """Mean / p50 / p95 of a list of timings"""
+    ordered = sorted(timings)
+    return {
+        "mean": sum(ordered) / len(ordered),
+        "p50": ordered[len(ordered) // 2],
+        "p95": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))]
+    }
+
+def print_row(name: str, stats: dict, extra: str = "", unit: str = "ms"):
+    factor = 1000 if unit == "us" else 1
+    print(f"  {name:<24} mean {stats['mean'] * factor:8.1f} {unit}   p50 {stats['p50'] * factor:8.1f} {unit}   "
+          f"p95 {stats['p95'] * factor:8.1f} {unit}   {extra}")
+
+def load_models_or_exit():
+    if not model_manager.load_models():
+        raise SystemExit("❌ Models could not be loaded")
+
+def benchmark_annotation(args):
+    """Compare annotated responses against boxes-only (annotate=false) responses"""
+    load_models_or_exit()
+    contents = load_image_bytes(args.image)
+
+    print("\n" + "="*60)
+    print(f"📊 Annotation benchmark ({args.runs} runs, confidence {args.confidence})")
+    print("="*60)
+
+    results = {}
+    for annotate in (True, False):
+        timings = time_call(lambda: run_image_detection(contents, args.confidence, annotate), args.runs)
+        detections = run_image_detection(contents, args.confidence, annotate)
+
+        payload = detections["detections"].to_dict()
+        payload_bytes = len(json.dumps(payload)) + len(detections.get("annotated_base64", ""))
+
+        results[annotate] = (summarize(timings), payload_bytes)
+        print_row("annotated" if annotate else "boxes only", results[annotate][0], f"payload {payload_bytes / 1024:8.1f} KB")
+
+    (annotated, annotated_bytes), (boxes_only, boxes_bytes) = results[True], results[False]
+    print(f"\n✅ Boxes-only saves {annotated['mean'] - boxes_only['mean']:.1f} ms per image "
+          f"({(1 - boxes_only['mean'] / annotated['mean']) * 100:.0f}%) "
+          f"and {(annotated_bytes - boxes_bytes) / 1024:.1f} KB of response payload")
+
+def match_detections(reference, candidate, iou_threshold: float = 0.5):
+    """Greedy same-class IoU matching; returns (matched, mean confidence difference)"""
+    if not reference or not candidate:
+        return 0, 0.0
+
+    ious = box_iou(
+        np.array([d["bbox"] for d in reference], dtype=np.float32),
+        np.array([d["bbox"] for d in candidate], dtype=np.float32)
+    )
+    same_class = np.array([[r["label"] == c["label"] for c in candidate] for r in reference])
+    ious[~same_class] = 0
+
+    used = set()
+    conf_diffs = []
+    for i, ref in enumerate(reference):
+        for j in np.argsort(-ious[i]):
+            if ious[i, j] < iou_threshold:
+                break
+            if j not in used:
+                used.add(j)
+                conf_diffs.append(abs(ref["confidence"] - candidate[j]["confidence"]))
+                break
+    return len(conf_diffs), (sum(conf_diffs) / len(conf_diffs) if conf_diffs else 0.0)
+
+def all_detections(result):
+    groups = result["detections"].to_dict()
+    return groups["objects"] + groups["traffic_lights"] + groups["zebra_crossings"]
+
+def benchmark_backends(args):
+    """Latency and agreement with the PyTorch models for each inference backend"""
+    image = decode_image(load_image_bytes(args.image))
+    model_path = 'models' if os.path.exists('models') else 'backend/models'
+
+    print("\n" + "="*60)
+    print(f"📊 Backend benchmark ({args.runs} runs, batch {args.batch}, confidence {args.confidence})")
+    print("="*60)
+
+    reference = None
+    for spec in ["pytorch"] + [b for b in args.backends if b != "pytorch"]:
+        backend, _, precision = spec.partition(":")
+        manager = ModelManager()
+        try:
+            manager.load_yolo_models(model_path, backend, precision or "fp32")
+        except Exception as e:
+            print(f"  {spec:<24} ❌ {e}")
+            continue
+
+        frames = [image] * args.batch
+        timings = time_call(lambda: manager.detect_batch(frames, args.confidence, annotate=False), args.runs)
+        detections = all_detections(manager.detect_batch([image], args.confidence, annotate=False)[0])
+
+        if reference is None:
+            reference = detections
+            agreement = f"{len(detections)} detections (reference)"
+        else:
+            matched, conf_diff = match_detections(reference, detections)
+            recall = matched / len(reference) if reference else 1.0
+            precision_ = matched / len(detections) if detections else 1.0
+            agreement = f"recall {recall:.2f}  precision {precision_:.2f}  |Δconf| {conf_diff:.3f}"
+
+        stats = summarize(timings)
+        print_row(spec, stats, f"{args.batch * 1000 / stats['mean']:6.1f} img/s   {agreement}")
+
+def synthetic_detections(count: int, rng, width: int = 1280, height: int = 720) -> Detections:
+    """Random street-like scene: count objects, a traffic light and a zebra crossing"""
+    names = (dict(enumerate(sorted(MOVING_OBJECTS | STATIC_OBJECTS))), {2: "green", 3: "red", 4: "yellow"}, {8: "zebra_crossing"})
+    corners = rng.random((count + 2, 2)) * [width * 0.8, height * 0.8]
+    sizes = rng.random((count + 2, 2)) * [width * 0.2, height * 0.2] + 4
+    return Detections(
+        np.hstack([corners, corners + sizes]).astype(np.float32),
+        rng.random(count + 2).astype(np.float32),
+        np.concatenate([rng.integers(0, len(names[0]), count), [3, 8]]).astype(np.int32),
+        np.array([Detections.OBJECTS] * count + [Detections.TRAFFIC_LIGHTS, Detections.ZEBRA_CROSSINGS], dtype=np.uint8),
+        names
+    )
+
+def benchmark_scene(args):
+    """Per-frame overhead of scene analysis and the description inputs built from it (no models needed)"""
+    rng = np.random.default_rng(0)
+    
+    print("\n" + "="*60)
+    print(f"📊 Scene analysis benchmark ({args.runs} runs)")
+    print("="*60)
+    
+    for count in args.objects:
+        found = synthetic_detections(count, rng)
+        
+        def describe():
+            scene = SceneAnalysis(found, 1280, 720)
+            scene_signature(scene)
+            template_voice_description(scene)
+            build_gemini_prompt(scene)
+        
+        print_row(f"{count} objects: analysis", summarize(time_call(lambda: SceneAnalysis(found, 1280, 720), args.runs)), unit="us")
+        print_row(f"{count} objects: + describe", summarize(time_call(describe, args.runs)), "signature + template + prompt", "us")
+
+def main():
+    parser = argparse.ArgumentParser(description="MyVision backend benchmarks")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    annotation = subparsers.add_parser("annotation", help="annotated vs boxes-only responses")
+    annotation.add_argument("--image", help="image to benchmark (default: synthetic 1280x720)")
+    annotation.add_argument("--runs", type=int, default=20)
+    annotation.add_argument("--confidence", type=float, default=0.4)
+    annotation.set_defaults(func=benchmark_annotation)
+
+    backends = subparsers.add_parser("backends", help="PyTorch vs ONNX Runtime / OpenVINO (fp32, int8)")
+    backends.add_argument("--image", help="image to benchmark (default: synthetic 1280x720)")
+    backends.add_argument("--backends", nargs="+", default=["pytorch", "onnx", "onnx:int8", "openvino"],
+                          help="backend[:precision] entries, e.g. onnx:int8 openvino:int8")
+    backends.add_argument("--runs", type=int, default=20)
+    backends.add_argument("--batch", type=int, default=1)
+    backends.add_argument("--confidence", type=float, default=0.4)
+    backends.set_defaults(func=benchmark_backends)
+
+    scene = subparsers.add_parser("scene", help="per-frame scene analysis / description overhead")
+    scene.add_argument("--objects", type=int, nargs="+", default=[5, 20, 100], help="objects per synthetic frame")
+    scene.add_argument("--runs", type=int, default=1000)
+    scene.set_defaults(func=benchmark_scene)
+    
+    args = parser.parse_args()
+    try:
+        args.func(args)
+    finally:
+        model_manager.shutdown()
+
+if __name__ == "__main__":
+    main()
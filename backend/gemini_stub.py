@@ -0,0 +1,62 @@
+"""
+Local stub for the Gemini API - lets the voice description path be tested without a key
+
+Usage:
+    python gemini_stub.py --port 8765 --delay 0.5
+    GEMINI_API_ENDPOINT=http://127.0.0.1:8765 python main.py
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+class GeminiStubHandler(BaseHTTPRequestHandler):
+    """Answers generateContent requests with a canned description after a fixed delay"""
+    delay = 0.0
+    calls = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+
+        with GeminiStubHandler.lock:
+            GeminiStubHandler.calls += 1
+            call = GeminiStubHandler.calls
+
+        time.sleep(self.delay)
+
+        body = json.dumps({
+            "candidates": [{
+                "content": {"parts": [{"text": f"Stub description {call}."}], "role": "model"},
+                "finishReason": "STOP",
+                "index": 0
+            }]
+        }).encode()
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        print(f"🤖 Gemini stub: {format % args}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Local Gemini API stub")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--delay", type=float, default=0.0, help="seconds before each response")
+    args = parser.parse_args()
+
+    GeminiStubHandler.delay = args.delay
+    server = ThreadingHTTPServer(("127.0.0.1", args.port), GeminiStubHandler)
+    print(f"🤖 Gemini stub listening on http://127.0.0.1:{args.port} (delay {args.delay}s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Gemini stub stopped")
+
+if __name__ == "__main__":
+    main()
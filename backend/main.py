@@ -1,22 +1,32 @@
-from fastapi import FastAPI, File, UploadFile, WebSocket, WebSocketDisconnect
+from fastapi import FastAPI, File, UploadFile, WebSocket, WebSocketDisconnect, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, StreamingResponse
-from contextlib import asynccontextmanager
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from contextlib import asynccontextmanager, contextmanager
 import cv2
 import numpy as np
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Callable, Tuple
 import base64
+import bisect
 import io
 from PIL import Image
-from ultralytics import YOLO
 import asyncio
-from collections import Counter
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
-import torch
-import google.generativeai as genai
+from collections import Counter, OrderedDict
 import os
+import json
+import hashlib
+import queue
+import shutil
+import struct
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from dotenv import load_dotenv
 
+# Heavy libraries (torch, ultralytics, transformers, google.generativeai) are imported
+# where they are first used, so the server starts fast and models load in the background
+
 # Load environment variables from .env file
 load_dotenv()
 
@@ -28,7 +38,13 @@ async def lifespan(app: FastAPI):
     print("🚀 Starting MyVision API Server")
     print("="*50)
     try:
-        model_manager.load_models()
+        # Models load in the background; /health reports their progress
+        model_manager.start_loading()
+        inference_pool.start()
+        video_pool.start()
+        live_scheduler.start()
+        video_jobs.start()
+        gemini_service.start()
         print("="*50 + "\n")
         yield
     except asyncio.CancelledError:
@@ -36,6 +52,12 @@ async def lifespan(app: FastAPI):
         print("⚠️ Asyncio task cancelled (Python 3.13 compatibility issue)")
     finally:
         # Shutdown
+        await live_scheduler.stop()
+        video_jobs.shutdown()
+        gemini_service.shutdown()
+        inference_pool.shutdown()
+        video_pool.shutdown()
+        model_manager.shutdown()
         print("🛑 Shutting down MyVision API Server")
 
 app = FastAPI(title="MyVision API", version="1.0.0", lifespan=lifespan)
@@ -52,14 +74,290 @@ app.add_middleware(
 # Gemini API Configuration
 # Load API key from environment variable for security
 GEMINI_API_KEY = os.getenv("GEMINI_API_KEY", "")
-if GEMINI_API_KEY:
-    genai.configure(api_key=GEMINI_API_KEY)
-else:
+# Optional alternative endpoint (e.g. a local stub server for testing), uses the REST transport
+GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT", "")
+if GEMINI_API_ENDPOINT:
+    print(f"🔧 Gemini endpoint: {GEMINI_API_ENDPOINT}")
+elif not GEMINI_API_KEY:
     print("⚠️  WARNING: GEMINI_API_KEY environment variable not set!")
     print("   Gemini AI features will not be available.")
     print("   Set it using: export GEMINI_API_KEY='your-key-here'  (Linux/Mac)")
     print("   Or: $env:GEMINI_API_KEY='your-key-here'  (Windows PowerShell)")
 
+# Model execution configuration
+# "parallel" runs the 3 YOLO models side by side, "sequential" runs them one after another
+MODEL_EXECUTION_MODE = os.getenv("MODEL_EXECUTION_MODE", "parallel").lower()
+# Torch intra-op threads per model worker (0 = split the CPU cores evenly between the 3 models)
+MODEL_THREADS_PER_MODEL = int(os.getenv("MODEL_THREADS_PER_MODEL", "0"))
+# Inference input size shared by all 3 models (multiple of 32)
+INFERENCE_IMGSZ = int(os.getenv("INFERENCE_IMGSZ", "640"))
+MODEL_STRIDE = 32
+# Per-endpoint inference sizes (each request can still pass ?imgsz=)
+IMAGE_IMGSZ = int(os.getenv("IMAGE_IMGSZ", str(INFERENCE_IMGSZ)))
+LIVE_IMGSZ = int(os.getenv("LIVE_IMGSZ", str(INFERENCE_IMGSZ)))
+VIDEO_IMGSZ = int(os.getenv("VIDEO_IMGSZ", str(INFERENCE_IMGSZ)))
+# Oversized images are decoded at 1/2, 1/4 or 1/8 scale as long as their long side stays
+# at least this large (and at least imgsz); boxes are mapped back to the original size. 0 disables
+DECODE_MIN_SIDE = int(os.getenv("DECODE_MIN_SIDE", "1280"))
+
+# Inference worker pool: blocking detection/encoding work runs here instead of on the event loop
+INFERENCE_WORKERS = int(os.getenv("INFERENCE_WORKERS", "2"))
+# Maximum number of jobs waiting for a free worker before requests are rejected with 503
+INFERENCE_QUEUE_SIZE = int(os.getenv("INFERENCE_QUEUE_SIZE", "16"))
+# /api/detect/video runs whole videos on a separate pool so they never hold an inference worker
+VIDEO_WORKERS = int(os.getenv("VIDEO_WORKERS", "1"))
+VIDEO_QUEUE_SIZE = int(os.getenv("VIDEO_QUEUE_SIZE", "2"))
+
+# Live micro-batching: frames from all WebSocket sessions are grouped into one batched predict
+# A batch is dispatched when it reaches LIVE_BATCH_SIZE frames or LIVE_BATCH_WAIT_MS has passed
+LIVE_BATCH_SIZE = int(os.getenv("LIVE_BATCH_SIZE", "8"))
+LIVE_BATCH_WAIT_MS = float(os.getenv("LIVE_BATCH_WAIT_MS", "10"))
+
+# Binary live frame header: frame id (uint32), client timestamp in ms (float64),
+# options JSON length (uint16); followed by the options JSON and the raw JPEG bytes
+LIVE_FRAME_HEADER = struct.Struct("!IdH")
+
+# Annotated videos are kept on disk and streamed back from /api/videos/{video_id}
+VIDEO_RESULTS_DIR = os.getenv("VIDEO_RESULTS_DIR", os.path.join(tempfile.gettempdir(), "myvision_videos"))
+# Seconds an annotated video stays downloadable before it is cleaned up
+VIDEO_RESULT_TTL = int(os.getenv("VIDEO_RESULT_TTL", "3600"))
+# Chunk size for spooling uploads to disk and streaming videos back
+FILE_CHUNK_SIZE = 1024 * 1024
+# Frames buffered between the decode -> inference -> encode stages of video processing
+VIDEO_PIPELINE_QUEUE_SIZE = int(os.getenv("VIDEO_PIPELINE_QUEUE_SIZE", "8"))
+# Sampled video frames run through the 3 models together in batches of this size
+VIDEO_BATCH_SIZE = int(os.getenv("VIDEO_BATCH_SIZE", "4"))
+# Frames held back while a batch fills up; a partial batch is run once this many are waiting
+VIDEO_MAX_PENDING_FRAMES = int(os.getenv("VIDEO_MAX_PENDING_FRAMES", "32"))
+
+# Asynchronous video jobs (/api/jobs/video): inputs, annotated videos and results are kept here
+VIDEO_JOBS_DIR = os.getenv("VIDEO_JOBS_DIR", os.path.join(tempfile.gettempdir(), "myvision_jobs"))
+# Video jobs processed at the same time, and jobs allowed to wait before submissions are rejected
+VIDEO_JOB_WORKERS = int(os.getenv("VIDEO_JOB_WORKERS", "1"))
+VIDEO_JOB_QUEUE_SIZE = int(os.getenv("VIDEO_JOB_QUEUE_SIZE", "8"))
+# Seconds a finished job (and its files) is kept
+VIDEO_JOB_TTL = int(os.getenv("VIDEO_JOB_TTL", "86400"))
+
+# Object tracking across video frames
+# Draw tracker-predicted boxes on frames between samples instead of repeating the last annotated frame
+VIDEO_TRACK_SKIPPED_FRAMES = os.getenv("VIDEO_TRACK_SKIPPED_FRAMES", "1") != "0"
+# Minimum IoU between a detection and a track's predicted box to continue the track
+TRACKER_IOU_THRESHOLD = float(os.getenv("TRACKER_IOU_THRESHOLD", "0.3"))
+# Sampled frames a track may go unmatched before it is dropped
+TRACKER_MAX_MISSES = int(os.getenv("TRACKER_MAX_MISSES", "2"))
+
+# Scene-change gate: reuse the previous detections while the scene barely changes
+# Mean absolute difference (0-255) of a downscaled grayscale frame vs. the last inferred frame; 0 disables
+SCENE_CHANGE_THRESHOLD = float(os.getenv("SCENE_CHANGE_THRESHOLD", "4.0"))
+# Force inference after this many consecutive reused frames/samples
+SCENE_MAX_REUSE = int(os.getenv("SCENE_MAX_REUSE", "5"))
+# ... or once this many seconds have passed since the last inference (video: seconds of video)
+SCENE_MAX_REUSE_SECONDS = float(os.getenv("SCENE_MAX_REUSE_SECONDS", "1.0"))
+# ... or when the mean colour (0-255, any BGR channel) inside a traffic light box of the last result changes this much
+SCENE_LIGHT_THRESHOLD = float(os.getenv("SCENE_LIGHT_THRESHOLD", "12"))
+
+# Voice description cache: scenes with the same signature reuse the previous description
+DESCRIPTION_CACHE_SIZE = int(os.getenv("DESCRIPTION_CACHE_SIZE", "256"))
+# Seconds a cached description stays valid; 0 disables the cache
+DESCRIPTION_CACHE_TTL = float(os.getenv("DESCRIPTION_CACHE_TTL", "30"))
+
+# Gemini calls: deadline before falling back to the template description (the call keeps
+# running and its result is cached for the next frame), rate limit and concurrent calls
+GEMINI_TIMEOUT = float(os.getenv("GEMINI_TIMEOUT", "1.5"))
+GEMINI_RATE_LIMIT = float(os.getenv("GEMINI_RATE_LIMIT", "2"))  # calls per second, 0 = unlimited
+GEMINI_BURST = int(os.getenv("GEMINI_BURST", "4"))
+GEMINI_WORKERS = int(os.getenv("GEMINI_WORKERS", "4"))
+
+# Flan-T5 text engine: "torch", "int8" (dynamic quantization) or "onnx" (needs optimum[onnxruntime])
+LLM_MODEL_NAME = os.getenv("LLM_MODEL_NAME", "google/flan-t5-small")
+LLM_BACKEND = os.getenv("LLM_BACKEND", "int8").lower()
+# Sentences generated together, and how long the engine waits for a batch to fill
+LLM_MAX_BATCH = int(os.getenv("LLM_MAX_BATCH", "16"))
+LLM_BATCH_WAIT_MS = float(os.getenv("LLM_BATCH_WAIT_MS", "5"))
+# Beam search for quality mode; fast (live) mode is always greedy with a shorter output
+LLM_NUM_BEAMS = int(os.getenv("LLM_NUM_BEAMS", "4"))
+LLM_MAX_LENGTH = int(os.getenv("LLM_MAX_LENGTH", "60"))
+LLM_FAST_MAX_LENGTH = int(os.getenv("LLM_FAST_MAX_LENGTH", "32"))
+# Memoized generations (the template describer only produces a small set of sentences)
+LLM_CACHE_SIZE = int(os.getenv("LLM_CACHE_SIZE", "1024"))
+# Seconds a blocking caller waits for generated sentences before keeping the originals
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "10"))
+# Rephrase template voice descriptions with Flan-T5 (off by default)
+LLM_POLISH_DESCRIPTIONS = os.getenv("LLM_POLISH_DESCRIPTIONS", "0").lower() in ("1", "true", "yes")
+
+# YOLO inference backend: "pytorch" (default), "onnx" (ONNX Runtime) or "openvino"
+MODEL_BACKEND = os.getenv("MODEL_BACKEND", "pytorch").lower()
+# "fp32" or "int8" (ONNX: dynamic weight quantization; OpenVINO: NNCF with MODEL_INT8_DATA calibration)
+MODEL_PRECISION = os.getenv("MODEL_PRECISION", "fp32").lower()
+# Where exported models are cached (default: <models>/exports), keyed by a hash of the .pt file
+MODEL_EXPORT_DIR = os.getenv("MODEL_EXPORT_DIR", "")
+MODEL_INT8_DATA = os.getenv("MODEL_INT8_DATA", "coco8.yaml")
+
+# Warmup: run the 3 models on synthetic frames before reporting ready, so the first
+# real request doesn't pay for lazy initialization (frame sizes are WIDTHxHEIGHT)
+MODEL_WARMUP = os.getenv("MODEL_WARMUP", "1").lower() in ("1", "true", "yes")
+WARMUP_FRAME_SIZES = os.getenv("WARMUP_FRAME_SIZES", "1280x720,640x480")
+WARMUP_BATCH_SIZES = os.getenv("WARMUP_BATCH_SIZES", f"1,{VIDEO_BATCH_SIZE}")
+
+# Traffic light cascade: YOLOv8m's own traffic-light boxes (COCO class 9) are used as region
+# proposals and only padded crops around them go through the traffic light model
+LIGHT_CASCADE = os.getenv("LIGHT_CASCADE", "0").lower() in ("1", "true", "yes")
+# Minimum YOLOv8m confidence for a traffic-light proposal
+LIGHT_PROPOSAL_CONF = float(os.getenv("LIGHT_PROPOSAL_CONF", "0.25"))
+# Padding around each proposal, as a fraction of the box's longer side
+LIGHT_CROP_PADDING = float(os.getenv("LIGHT_CROP_PADDING", "0.5"))
+# Inference size for the crops (multiple of 32)
+LIGHT_CROP_IMGSZ = int(os.getenv("LIGHT_CROP_IMGSZ", "160"))
+# Every Nth batch still runs the traffic light model on the full frame (0 = never)
+LIGHT_FULL_FRAME_EVERY = int(os.getenv("LIGHT_FULL_FRAME_EVERY", "10"))
+
+# Result cache for /api/detect/image, keyed on a hash of the image bytes + inference options
+# In-memory LRU bounded by bytes (0 disables it)
+IMAGE_CACHE_MAX_BYTES = int(float(os.getenv("IMAGE_CACHE_MAX_MB", "64")) * 1024 * 1024)
+# Optional disk tier (survives restarts), bounded separately; empty = memory only
+IMAGE_CACHE_DIR = os.getenv("IMAGE_CACHE_DIR", "")
+IMAGE_CACHE_DISK_MAX_BYTES = int(float(os.getenv("IMAGE_CACHE_DISK_MAX_MB", "1024")) * 1024 * 1024)
+
+# Metrics: per-stage / per-endpoint latency histograms and runtime gauges on /metrics (Prometheus text)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "1").lower() in ("1", "true", "yes")
+# Histogram bucket upper bounds in seconds
+METRICS_BUCKETS = tuple(float(b) for b in os.getenv(
+    "METRICS_BUCKETS", "0.001,0.0025,0.005,0.01,0.025,0.05,0.1,0.25,0.5,1,2.5,5,10,30,60"
+).split(","))
+
+# --- Metrics ---
+
+class MetricsRegistry:
+    """Thread-safe latency histograms and gauges, rendered in the Prometheus text format.
+    
+    An observation is a bisect plus a few additions under one lock (a few microseconds),
+    so the pipeline can be timed per stage without measurable overhead.
+    """
+    
+    HISTOGRAMS = {
+        "myvision_stage_seconds": "Time per pipeline stage call (model stages cover a whole batch)",
+        "myvision_request_seconds": "HTTP request latency per endpoint",
+        "myvision_live_frame_seconds": "Live frame latency from receipt to response"
+    }
+    # Gauges updated inline with add_gauge()
+    GAUGES = {
+        "myvision_websocket_sessions": "Open live detection WebSocket sessions"
+    }
+    
+    def __init__(self, enabled: bool, buckets: tuple):
+        self.enabled = enabled
+        self.buckets = tuple(sorted(buckets))
+        # (name, labels) -> [per-bucket counts (+Inf last), sum, count]
+        self.histograms = {}
+        # (name, labels) -> value, for gauges maintained inline (e.g. open WebSockets)
+        self.gauges = Counter({(name, ()): 0 for name in self.GAUGES})
+        self.lock = threading.Lock()
+    
+    def observe(self, name: str, seconds: float, **labels):
+        if not self.enabled:
+            return
+        key = (name, tuple(sorted(labels.items())))
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            histogram[0][index] += 1
+            histogram[1] += seconds
+            histogram[2] += 1
+    
+    @contextmanager
+    def timer(self, stage: str):
+        """Time a block as one observation of myvision_stage_seconds{stage=...}"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe("myvision_stage_seconds", time.perf_counter() - start, stage=stage)
+    
+    def add_gauge(self, name: str, delta: float):
+        with self.lock:
+            self.gauges[(name, ())] += delta
+    
+    @staticmethod
+    def format_labels(labels) -> str:
+        if not labels:
+            return ""
+        def escape(value) -> str:
+            return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        return "{" + ",".join(f'{key}="{escape(value)}"' for key, value in labels) + "}"
+    
+    def render(self, samples: List[tuple]) -> str:
+        """Exposition text for the histograms, inline gauges and `samples`.
+        
+        samples are (name, type, help, labels dict, value) tuples collected at scrape time.
+        """
+        lines = []
+        with self.lock:
+            histograms = {key: (list(counts), total, count) for key, (counts, total, count) in self.histograms.items()}
+            gauges = dict(self.gauges)
+        
+        for name, help_text in self.HISTOGRAMS.items():
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+            for (metric, labels), (counts, total, count) in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                    cumulative += bucket_count
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{name}_bucket{self.format_labels(labels + (('le', le),))} {cumulative}")
+                lines.append(f"{name}_sum{self.format_labels(labels)} {total}")
+                lines.append(f"{name}_count{self.format_labels(labels)} {count}")
+        
+        described = set()
+        for (name, labels), value in sorted(gauges.items()):
+            samples.append((name, "gauge", self.GAUGES.get(name, ""), dict(labels), value))
+        for name, metric_type, help_text, labels, value in samples:
+            if name not in described:
+                described.add(name)
+                if help_text:
+                    lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} {metric_type}")
+            lines.append(f"{name}{self.format_labels(sorted(labels.items()))} {value}")
+        
+        return "\n".join(lines) + "\n"
+
+metrics = MetricsRegistry(METRICS_ENABLED, METRICS_BUCKETS)
+
+class RequestMetricsMiddleware:
+    """Pure ASGI middleware timing every HTTP request by route template and status code"""
+    
+    def __init__(self, app):
+        self.app = app
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not metrics.enabled:
+            return await self.app(scope, receive, send)
+        
+        start = time.perf_counter()
+        status = [500]
+        
+        async def send_with_status(message):
+            if message["type"] == "http.response.start":
+                status[0] = message["status"]
+            await send(message)
+        
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            # Route templates (/api/jobs/{job_id}) keep the label set small
+            route = scope.get("route")
+            metrics.observe(
+                "myvision_request_seconds",
+                time.perf_counter() - start,
+                endpoint=getattr(route, "path", "unmatched"),
+                method=scope["method"],
+                status=status[0]
+            )
+
+app.add_middleware(RequestMetricsMiddleware)
+
 # Global models storage
 class ModelManager:
     def __init__(self):
@@ -67,6 +365,7 @@ class ModelManager:
         self.model_lights = None
         self.model_zebra = None
         self.models_loaded = False
+        self.backend = None
         # LLM for natural language generation
         self.tokenizer = None
         self.llm_model = None
@@ -74,150 +373,1513 @@ class ModelManager:
         # Gemini model for advanced intelligence
         self.gemini_model = None
         self.gemini_loaded = False
+        # Thread pool that runs the 3 YOLO models concurrently
+        self.model_executor = None
+        # Traffic light cascade counters (batches, full-frame passes, crops)
+        self.cascade_stats = Counter()
+        # One lock per model: an ultralytics model must not predict from two threads at once
+        self.model_locks = {
+            "yolo": threading.Lock(),
+            "lights": threading.Lock(),
+            "zebra": threading.Lock()
+        }
+        # Background loading: per-model state ("pending", "loading", "ready", "failed") and load time
+        self.model_status = {name: {"state": "pending"} for name in self.MODEL_NAMES}
+        self.yolo_futures = []
+        self.yolo_ready = 0
+        self.status_lock = threading.Lock()
+        self.warmup_status = {"state": "pending" if MODEL_WARMUP else "disabled"}
+    
+    MODEL_NAMES = ("yolov8m", "traffic_lights", "zebra_crossing", "flan_t5", "gemini")
+    # Model name -> (attribute, weights file) for the 3 YOLO models
+    YOLO_MODELS = {
+        "yolov8m": ("model_yolo", "yolov8m.pt"),
+        "traffic_lights": ("model_lights", "traffic_lights.pt"),
+        "zebra_crossing": ("model_zebra", "zebra_crossing.pt")
+    }
+    
+    def load_models(self) -> bool:
+        """Load all models and wait for the 3 YOLO models (scripts and benchmarks)"""
+        self.start_loading()
+        return self.wait_until_loaded()
+    
+    def start_loading(self):
+        """Load the 3 YOLO models, Flan-T5 and Gemini concurrently in the background.
+        
+        Detection endpoints serve as soon as models_loaded is set (all 3 YOLO models ready);
+        Flan-T5 and Gemini only improve descriptions and become available whenever they finish.
+        """
+        loader = ThreadPoolExecutor(max_workers=len(self.MODEL_NAMES), thread_name_prefix="model-loader")
         
-    def load_models(self):
-        """Load all 3 YOLO models and Flan-T5 LLM"""
         try:
-            import os
-            # Determine the correct path based on current working directory
-            if os.path.exists('models'):
-                # Running from backend directory
-                model_path = 'models'
-            elif os.path.exists('backend/models'):
-                # Running from project root
-                model_path = 'backend/models'
-            else:
-                raise FileNotFoundError("Could not find models directory")
-            
-            print("🔄 Loading YOLOv8m model...")
-            self.model_yolo = YOLO(f'{model_path}/yolov8m.pt')
-            print("✅ YOLOv8m model loaded.")
-            
-            print("🔄 Loading Traffic Light model...")
-            self.model_lights = YOLO(f'{model_path}/traffic_lights.pt')
-            print("✅ Traffic Light model loaded.")
-            
-            print("🔄 Loading Zebra Crossing model...")
-            self.model_zebra = YOLO(f'{model_path}/zebra_crossing.pt')
-            print("✅ Zebra Crossing model loaded.")
-            
-            self.models_loaded = True
-            print("✅ All YOLO models loaded successfully!")
-            
-            # Load Flan-T5 LLM for natural language generation
-            try:
-                print("🔄 Loading Flan-T5 language model...")
-                self.tokenizer = AutoTokenizer.from_pretrained("google/flan-t5-small")
-                self.llm_model = AutoModelForSeq2SeqLM.from_pretrained("google/flan-t5-small")
-                self.llm_loaded = True
-                print("✅ Flan-T5 model loaded successfully!")
-            except Exception as llm_error:
-                print(f"⚠️ Flan-T5 model not loaded: {llm_error}")
-                print("   Voice descriptions will use template-based generation.")
-                self.llm_loaded = False
-            
-            # Load Gemini model for advanced AI intelligence
-            try:
-                print("🔄 Loading Gemini AI model...")
-                self.gemini_model = genai.GenerativeModel('gemini-1.5-flash')
-                self.gemini_loaded = True
-                print("✅ Gemini AI model loaded successfully!")
-                print("   🎯 Advanced voice intelligence enabled!")
-            except Exception as gemini_error:
-                print(f"⚠️ Gemini model not loaded: {gemini_error}")
-                print("   Will fallback to Flan-T5 or template-based generation.")
-                self.gemini_loaded = False
-            
-            return True
-            
-        except Exception as e:
+            model_path = find_model_dir()
+            self.yolo_futures = [
+                loader.submit(self._load_tracked_yolo, name, model_path)
+                for name in self.YOLO_MODELS
+            ]
+        except FileNotFoundError as e:
             print(f"❌ ERROR loading models: {e}")
             print("Please ensure models are in models/ or backend/models/ folder")
-            self.models_loaded = False
+            for name in self.YOLO_MODELS:
+                self._set_status(name, state="failed", error=str(e))
+        
+        loader.submit(self._load, "flan_t5", self._load_llm)
+        loader.submit(self._load, "gemini", self._load_gemini)
+        # Loader threads finish their work and exit; nothing else is submitted
+        loader.shutdown(wait=False)
+    
+    def wait_until_loaded(self, timeout: Optional[float] = None) -> bool:
+        """Block until the YOLO models finished loading (or failed)"""
+        for future in self.yolo_futures:
+            future.exception(timeout=timeout)
+        return self.models_loaded
+    
+    @property
+    def loading(self) -> bool:
+        if self.warmup_status["state"] == "running":
+            return True
+        return any(self.model_status[name]["state"] in ("pending", "loading") for name in self.YOLO_MODELS)
+    
+    def status_report(self) -> Dict:
+        with self.status_lock:
+            return {name: dict(status) for name, status in self.model_status.items()}
+    
+    def _set_status(self, name: str, **fields):
+        with self.status_lock:
+            self.model_status[name] = fields
+    
+    def _load(self, name: str, load_func, *args) -> bool:
+        """Run one loader, recording its state and load time"""
+        self._set_status(name, state="loading")
+        start = time.perf_counter()
+        try:
+            load_func(*args)
+        except Exception as e:
+            self._set_status(name, state="failed", error=str(e), load_seconds=round(time.perf_counter() - start, 2))
             return False
+        self._set_status(name, state="ready", load_seconds=round(time.perf_counter() - start, 2))
+        return True
+    
+    def _load_yolo(self, name: str, model_path: str):
+        attribute, weights = self.YOLO_MODELS[name]
+        print(f"🔄 Loading {weights}...")
+        try:
+            setattr(self, attribute, load_yolo_model(model_path, weights, MODEL_BACKEND, MODEL_PRECISION))
+        except Exception as e:
+            print(f"❌ ERROR loading {weights}: {e}")
+            raise
+        print(f"✅ {weights} loaded.")
     
-    def detect_all(self, image: np.ndarray, conf_threshold: float = 0.4):
+    def _load_tracked_yolo(self, name: str, model_path: str):
+        if not self._load(name, self._load_yolo, name, model_path):
+            return
+        with self.status_lock:
+            self.yolo_ready += 1
+            last = self.yolo_ready == len(self.YOLO_MODELS)
+        if last:
+            # Last of the 3 models: warm up and start serving detections
+            self._yolo_models_ready(MODEL_BACKEND, MODEL_PRECISION)
+    
+    def _yolo_models_ready(self, backend: str, precision: str):
+        if MODEL_EXECUTION_MODE == "parallel" and self.model_executor is None:
+            self.start_model_executor()
+        self.backend = f"{backend}/{precision}" if backend != "pytorch" else backend
+        print(f"✅ All YOLO models loaded successfully! ({self.backend} backend)")
+        
+        if MODEL_WARMUP:
+            self.warmup()
+        self.models_loaded = True
+    
+    def warmup(self):
+        """Run every configured frame size and batch size through the models once.
+        
+        The first predict on each input shape pays for ultralytics/torch setup (layer
+        fusion, allocator growth, backend graph compilation); doing it here keeps it
+        out of the first real request. Timings are kept in warmup_status for /health.
+        """
+        self.warmup_status = {"state": "running"}
+        sizes = [tuple(int(v) for v in size.lower().split("x")) for size in WARMUP_FRAME_SIZES.split(",") if size.strip()]
+        batch_sizes = [int(b) for b in WARMUP_BATCH_SIZES.split(",") if b.strip()]
+        imgszs = sorted({IMAGE_IMGSZ, LIVE_IMGSZ, VIDEO_IMGSZ})
+        
+        print(f"🔥 Warming up models ({len(sizes)} frame sizes x {len(batch_sizes)} batch sizes x {len(imgszs)} input sizes)...")
+        start = time.perf_counter()
+        runs = []
+        try:
+            rng = np.random.default_rng(0)
+            for width, height in sizes:
+                frame = rng.integers(0, 256, (height, width, 3), dtype=np.uint8)
+                for imgsz in imgszs:
+                    for batch_size in batch_sizes:
+                        run_start = time.perf_counter()
+                        self.detect_batch([frame] * batch_size, 0.4, annotate=True, imgsz=imgsz)
+                        runs.append({
+                            "frame_size": f"{width}x{height}",
+                            "imgsz": imgsz,
+                            "batch_size": batch_size,
+                            "ms": round((time.perf_counter() - run_start) * 1000, 1)
+                        })
+        except Exception as e:
+            # A failed warmup only costs latency, the models themselves are loaded
+            print(f"⚠️ Warmup failed: {e}")
+            self.warmup_status = {"state": "failed", "error": str(e), "runs": runs}
+            return
+        
+        seconds = round(time.perf_counter() - start, 2)
+        self.warmup_status = {"state": "done", "seconds": seconds, "runs": runs}
+        print(f"✅ Warmup done in {seconds}s")
+    
+    def _load_llm(self):
+        # Load Flan-T5 LLM for natural language generation
+        try:
+            print("🔄 Loading Flan-T5 language model...")
+            self.tokenizer, self.llm_model = text_engine.load(LLM_MODEL_NAME, LLM_BACKEND)
+            self.llm_loaded = True
+            print(f"✅ Flan-T5 model loaded successfully! ({text_engine.backend} backend)")
+        except Exception as llm_error:
+            print(f"⚠️ Flan-T5 model not loaded: {llm_error}")
+            print("   Voice descriptions will use template-based generation.")
+            self.llm_loaded = False
+            raise
+    
+    def _load_gemini(self):
+        # Load Gemini model for advanced AI intelligence
+        try:
+            print("🔄 Loading Gemini AI model...")
+            if not (GEMINI_API_KEY or GEMINI_API_ENDPOINT):
+                # Every call would fail; /health reports gemini as failed instead
+                raise RuntimeError("GEMINI_API_KEY is not set")
+            import google.generativeai as genai
+            if GEMINI_API_ENDPOINT:
+                genai.configure(
+                    api_key=GEMINI_API_KEY or "stub",
+                    transport="rest",
+                    client_options={"api_endpoint": GEMINI_API_ENDPOINT}
+                )
+            elif GEMINI_API_KEY:
+                genai.configure(api_key=GEMINI_API_KEY)
+            self.gemini_model = genai.GenerativeModel('gemini-1.5-flash')
+            self.gemini_loaded = True
+            print("✅ Gemini AI model loaded successfully!")
+            print("   🎯 Advanced voice intelligence enabled!")
+        except Exception as gemini_error:
+            print(f"⚠️ Gemini model not loaded: {gemini_error}")
+            print("   Will fallback to Flan-T5 or template-based generation.")
+            self.gemini_loaded = False
+            raise
+    
+    def load_yolo_models(self, model_path: str, backend: str = "pytorch", precision: str = "fp32"):
+        """Load the 3 YOLO models one after another in the calling thread (used by benchmarks)"""
+        for name, (attribute, weights) in self.YOLO_MODELS.items():
+            print(f"🔄 Loading {weights}...")
+            setattr(self, attribute, load_yolo_model(model_path, weights, backend, precision))
+            self._set_status(name, state="ready")
+        self._yolo_models_ready(backend, precision)
+    
+    def start_model_executor(self):
+        """Create the thread pool used to run the 3 YOLO models in parallel"""
+        threads_per_model = MODEL_THREADS_PER_MODEL or max(1, (os.cpu_count() or 3) // 3)
+        
+        def init_worker():
+            import torch
+            # Each worker gets its own intra-op thread budget so the 3 models don't oversubscribe the CPU
+            torch.set_num_threads(threads_per_model)
+        
+        self.model_executor = ThreadPoolExecutor(
+            max_workers=3,
+            thread_name_prefix="yolo-model",
+            initializer=init_worker
+        )
+        print(f"⚡ Parallel model execution enabled ({threads_per_model} threads per model)")
+    
+    def shutdown(self):
+        """Release the model thread pool"""
+        if self.model_executor:
+            self.model_executor.shutdown(wait=False)
+            self.model_executor = None
+    
+    def _predict(self, key: str, model, batch_tensor: "torch.Tensor", classes: List[int], conf_threshold: float):
+        """Run a single YOLO model on the preprocessed batch, serialized per model"""
+        with self.model_locks[key], metrics.timer(f"predict_{key}"):
+            return model.predict(batch_tensor, classes=classes, conf=conf_threshold, verbose=False)
+    
+    def detect_all(self, image: np.ndarray, conf_threshold: float = 0.4, annotate: bool = True, imgsz: Optional[int] = None):
         """Run all 3 models and combine results"""
-        if not self.models_loaded:
+        return self.detect_batch([image], conf_threshold, annotate, imgsz)[0]
+    
+    def detect_batch(
+        self,
+        images: List[np.ndarray],
+        conf_threshold: float = 0.4,
+        annotate: bool = True,
+        imgsz: Optional[int] = None
+    ):
+        """Run all 3 models on a batch of frames and combine results per frame.
+        
+        With annotate=False the boxes are not drawn and "annotated_image" stays None.
+        imgsz is the letterbox size for inference (default INFERENCE_IMGSZ); boxes are
+        always returned in the coordinates of the frames passed in.
+        """
+        if self.model_yolo is None or self.model_lights is None or self.model_zebra is None:
             raise ValueError("Models not loaded")
         
-        all_detections = {
-            "objects": [],
-            "traffic_lights": [],
-            "zebra_crossings": [],
-            "annotated_image": None
+        # YOLOv8m: exclude traffic light class ID 9
+        # Traffic Light Model: classes 2,3,4 = green, red, yellow
+        # Zebra Crossing Model: class 8 = zebra crossing
+        yolo_classes_to_keep = [i for i in range(80) if i != 9]
+        light_classes_to_keep = [2, 3, 4]
+        zebra_classes_to_keep = [8]
+        stages = {
+            "yolo": (self.model_yolo, yolo_classes_to_keep, conf_threshold),
+            "lights": (self.model_lights, light_classes_to_keep, conf_threshold),
+            "zebra": (self.model_zebra, zebra_classes_to_keep, conf_threshold)
         }
         
-        # --- STEP 1: Run YOLOv8m (exclude traffic light class ID 9)
-        yolo_classes_to_keep = [i for i in range(80) if i != 9]
-        print("⚙️ Running YOLOv8m (cars, people, etc.)...")
-        results_yolo = self.model_yolo.predict(image, classes=yolo_classes_to_keep, conf=conf_threshold, verbose=False)
-        
-        # Get detections
-        for box in results_yolo[0].boxes:
-            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-            conf = float(box.conf[0])
-            cls = int(box.cls[0])
-            label = self.model_yolo.names[cls]
+        cascade = LIGHT_CASCADE
+        if cascade:
+            # Keep YOLOv8m's traffic lights as proposals; the light model only runs full-frame on its cadence
+            stages["yolo"] = (self.model_yolo, list(range(80)), min(conf_threshold, LIGHT_PROPOSAL_CONF))
+            with self.status_lock:
+                self.cascade_stats["batches"] += 1
+                full_frame = LIGHT_FULL_FRAME_EVERY > 0 and (self.cascade_stats["batches"] - 1) % LIGHT_FULL_FRAME_EVERY == 0
+                if full_frame:
+                    self.cascade_stats["full_frame_passes"] += 1
+            if not full_frame:
+                del stages["lights"]
+        
+        # Letterbox + normalize once, all 3 models share the same tensor
+        with metrics.timer("preprocess"):
+            batch_tensor, letterbox = preprocess_frames(images, imgsz or INFERENCE_IMGSZ)
+        
+        if self.model_executor:
+            print("⚙️ Running YOLOv8m, Traffic Light and Zebra Crossing models in parallel...")
+            futures = {
+                key: self.model_executor.submit(self._predict, key, model, batch_tensor, classes, conf)
+                for key, (model, classes, conf) in stages.items()
+            }
+            results = {key: future.result() for key, future in futures.items()}
+        else:
+            results = {}
+            for key, (model, classes, conf) in stages.items():
+                print(f"⚙️ Running {key} model...")
+                results[key] = self._predict(key, model, batch_tensor, classes, conf)
+        
+        # Map boxes from the letterboxed tensor back onto the original frames
+        with metrics.timer("restore_boxes"):
+            for key in stages:
+                restore_results(results[key], images, letterbox)
+        
+        if cascade:
+            results["yolo"], proposals = self._split_light_proposals(results["yolo"], conf_threshold)
+            if "lights" not in results:
+                with metrics.timer("light_crops"):
+                    results["lights"] = self._classify_light_crops(images, proposals, conf_threshold)
+        
+        return [
+            self._combine_results(results["yolo"][i], results["lights"][i], results["zebra"][i], annotate)
+            for i in range(len(images))
+        ]
+    
+    def _split_light_proposals(self, yolo_results, conf_threshold: float):
+        """Separate YOLOv8m's traffic lights (class 9) from the objects it reports"""
+        objects, proposals = [], []
+        for result in yolo_results:
+            cls, conf = result.boxes.cls, result.boxes.conf
+            is_light = cls == 9
+            proposals.append(result.boxes.xyxy[is_light & (conf >= LIGHT_PROPOSAL_CONF)].cpu().numpy())
+            objects.append(result[~is_light & (conf >= conf_threshold)])
+        return objects, proposals
+    
+    def _classify_light_crops(self, images: List[np.ndarray], proposals: List[np.ndarray], conf_threshold: float):
+        """Run the traffic light model on padded crops around the proposals, as one batch.
+        
+        Returns one Results per frame with the boxes in frame coordinates, so the rest
+        of the pipeline (combine, plot) treats them like a full-frame pass.
+        """
+        import torch
+        import torchvision
+        from ultralytics.engine.results import Results
+        
+        crops, owners, origins = [], [], []
+        for index, (image, boxes) in enumerate(zip(images, proposals)):
+            height, width = image.shape[:2]
+            for x1, y1, x2, y2 in boxes:
+                pad = LIGHT_CROP_PADDING * max(x2 - x1, y2 - y1)
+                left, top = int(max(0, x1 - pad)), int(max(0, y1 - pad))
+                right, bottom = int(min(width, x2 + pad)), int(min(height, y2 + pad))
+                if right - left < 2 or bottom - top < 2:
+                    continue
+                crops.append(image[top:bottom, left:right])
+                owners.append(index)
+                origins.append((left, top))
+        
+        frame_boxes = [[] for _ in images]
+        if crops:
+            with self.status_lock:
+                self.cascade_stats["crops"] += len(crops)
+            crop_tensor, crop_letterbox = preprocess_frames(crops, LIGHT_CROP_IMGSZ)
+            crop_results = self._predict("lights", self.model_lights, crop_tensor, [2, 3, 4], conf_threshold)
+            restore_results(crop_results, crops, crop_letterbox)
             
-            all_detections["objects"].append({
-                "bbox": [int(x1), int(y1), int(x2), int(y2)],
-                "confidence": conf,
-                "class_id": cls,
-                "label": label
-            })
+            for result, index, (left, top) in zip(crop_results, owners, origins):
+                data = result.boxes.data.clone()
+                data[:, [0, 2]] += left
+                data[:, [1, 3]] += top
+                frame_boxes[index].append(data)
         
-        annotated_image = results_yolo[0].plot()
-        print(f"✅ Step 1: {len(all_detections['objects'])} objects detected")
+        results = []
+        for image, boxes in zip(images, frame_boxes):
+            data = torch.cat(boxes) if boxes else torch.zeros((0, 6))
+            if len(data) > 1:
+                # Overlapping crops can see the same light twice
+                data = data[torchvision.ops.nms(data[:, :4], data[:, 4], 0.5)]
+            results.append(Results(orig_img=image, path="", names=self.model_lights.names, boxes=data))
+        return results
+    
+    def _combine_results(self, result_yolo, result_lights, result_zebra, annotate: bool = True):
+        """Merge one frame's results from the 3 models into a Detections container (+ annotated image)"""
+        # One device -> host transfer per model instead of per-box tensor ops
+        found = Detections.concat([
+            Detections.from_boxes(result_yolo.boxes, Detections.OBJECTS),
+            Detections.from_boxes(result_lights.boxes, Detections.TRAFFIC_LIGHTS),
+            Detections.from_boxes(result_zebra.boxes, Detections.ZEBRA_CROSSINGS)
+        ], self.detection_names())
         
-        # --- STEP 2: Run Traffic Light Model (classes 2,3,4 = green, red, yellow)
-        light_classes_to_keep = [2, 3, 4]
-        print("⚙️ Running Traffic Light model...")
-        results_lights = self.model_lights.predict(image, classes=light_classes_to_keep, conf=conf_threshold, verbose=False)
-        
-        for box in results_lights[0].boxes:
-            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-            conf = float(box.conf[0])
-            cls = int(box.cls[0])
-            label = self.model_lights.names[cls]
+        counts = found.counts()
+        print(f"✅ Step 1: {counts['objects']} objects detected")
+        print(f"✅ Step 2: {counts['traffic_lights']} traffic lights detected")
+        print(f"✅ Step 3: {counts['zebra_crossings']} zebra crossings detected")
+        
+        all_detections = {"detections": found, "annotated_image": None}
+        
+        # Draw all 3 models' boxes onto one image (skipped for boxes-only responses)
+        if annotate:
+            with metrics.timer("plot"):
+                annotated_image = result_yolo.plot()
+                annotated_image = result_lights.plot(img=annotated_image)
+                all_detections["annotated_image"] = result_zebra.plot(img=annotated_image)
+        
+        return all_detections
+    
+    def detection_names(self) -> tuple:
+        """Class id -> label for each detection source (every zebra class is "zebra_crossing")"""
+        return (
+            self.model_yolo.names,
+            self.model_lights.names,
+            {cls: "zebra_crossing" for cls in self.model_zebra.names}
+        )
+
+# --- Columnar Detections ---
+
+class Detections:
+    """One frame's detections from all 3 models as contiguous NumPy arrays.
+    
+    Rows are boxes: xyxy (N, 4) float32, conf (N,) float32, cls (N,) int32 and source
+    (N,) uint8, which says which model (group) a row came from. Filtering, merging and
+    scaling stay vectorized; to_dict() builds the JSON shape at the response boundary.
+    """
+    
+    GROUPS = ("objects", "traffic_lights", "zebra_crossings")
+    OBJECTS, TRAFFIC_LIGHTS, ZEBRA_CROSSINGS = range(3)
+    
+    def __init__(self, xyxy: np.ndarray, conf: np.ndarray, cls: np.ndarray, source: np.ndarray, names: tuple = ({}, {}, {})):
+        self.xyxy = xyxy
+        self.conf = conf
+        self.cls = cls
+        self.source = source
+        # Per source: class id -> label
+        self.names = names
+    
+    @classmethod
+    def empty(cls, names: tuple = ({}, {}, {})) -> "Detections":
+        return cls(
+            np.zeros((0, 4), dtype=np.float32),
+            np.zeros(0, dtype=np.float32),
+            np.zeros(0, dtype=np.int32),
+            np.zeros(0, dtype=np.uint8),
+            names
+        )
+    
+    @classmethod
+    def from_boxes(cls, boxes, source: int, names: tuple = ({}, {}, {})) -> "Detections":
+        """Columns of an ultralytics Boxes object, copied to the host in one transfer"""
+        data = boxes.data.cpu().numpy()  # (N, 6): x1, y1, x2, y2, conf, cls
+        return cls(
+            np.ascontiguousarray(data[:, :4], dtype=np.float32),
+            data[:, 4].astype(np.float32),
+            data[:, 5].astype(np.int32),
+            np.full(len(data), source, dtype=np.uint8),
+            names
+        )
+    
+    @classmethod
+    def concat(cls, parts: List["Detections"], names: Optional[tuple] = None) -> "Detections":
+        """Merge several containers (e.g. the 3 models' outputs) into one"""
+        if names is None:
+            names = parts[0].names if parts else ({}, {}, {})
+        if not parts:
+            return cls.empty(names)
+        return cls(
+            np.concatenate([p.xyxy for p in parts]),
+            np.concatenate([p.conf for p in parts]),
+            np.concatenate([p.cls for p in parts]),
+            np.concatenate([p.source for p in parts]),
+            names
+        )
+    
+    def __len__(self) -> int:
+        return len(self.conf)
+    
+    def __getitem__(self, index) -> "Detections":
+        """Rows selected by a boolean mask, index array or slice"""
+        return Detections(self.xyxy[index], self.conf[index], self.cls[index], self.source[index], self.names)
+    
+    def group(self, source: int) -> "Detections":
+        return self[self.source == source]
+    
+    def filter(self, min_conf: float) -> "Detections":
+        return self[self.conf >= min_conf]
+    
+    def counts(self) -> Dict[str, int]:
+        per_source = np.bincount(self.source, minlength=len(self.GROUPS))
+        return {group: int(count) for group, count in zip(self.GROUPS, per_source)}
+    
+    def scaled(self, scale: float) -> "Detections":
+        """Boxes mapped by a uniform factor (e.g. from a downscaled decode back to the original image)"""
+        if scale == 1.0:
+            return self
+        return Detections(self.xyxy * np.float32(scale), self.conf, self.cls, self.source, self.names)
+    
+    def labels(self) -> List[str]:
+        return [self.names[source].get(cls, str(cls)) for source, cls in zip(self.source.tolist(), self.cls.tolist())]
+    
+    def to_dict(self) -> Dict[str, List[Dict]]:
+        """The API's per-group lists of {"bbox", "confidence", "class_id", "label"} dicts"""
+        groups = {group: [] for group in self.GROUPS}
+        rows = zip(
+            self.xyxy.astype(np.int64).tolist(),
+            self.conf.tolist(),
+            self.cls.tolist(),
+            self.source.tolist(),
+            self.labels()
+        )
+        for bbox, conf, cls, source, label in rows:
+            detection = {"bbox": bbox, "confidence": conf, "class_id": cls, "label": label}
+            if source == self.TRAFFIC_LIGHTS:
+                detection["color"] = label  # green/red/yellow
+            groups[self.GROUPS[source]].append(detection)
+        return groups
+
+# --- Inference Backends ---
+
+def find_model_dir() -> str:
+    """Models folder, whether the server runs from backend/ or the project root"""
+    if os.path.exists('models'):
+        # Running from backend directory
+        return 'models'
+    if os.path.exists('backend/models'):
+        # Running from project root
+        return 'backend/models'
+    raise FileNotFoundError("Could not find models directory")
+
+def load_yolo_model(model_path: str, weights: str, backend: str, precision: str):
+    """One YOLO model on the configured backend (exported on first use)"""
+    from ultralytics import YOLO
+    export_dir = MODEL_EXPORT_DIR or os.path.join(model_path, "exports")
+    return YOLO(resolve_model_weights(f'{model_path}/{weights}', backend, precision, export_dir), task="detect")
+
+def file_digest(path: str) -> str:
+    """Short sha256 of a file, used to key exported models to their weights"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(FILE_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()[:16]
+
+def resolve_model_weights(weights_path: str, backend: str, precision: str, export_dir: str) -> str:
+    """Path to load for a model on the given backend, exporting (and caching) it if needed.
+    
+    Exports are stored as <export_dir>/<name>-<weights hash>-<precision>.onnx or
+    ..._openvino_model/, so retrained weights are exported again automatically.
+    """
+    if backend == "pytorch":
+        return weights_path
+    from ultralytics import YOLO
+    if backend not in ("onnx", "openvino"):
+        raise ValueError(f"Unknown MODEL_BACKEND '{backend}'")
+    if precision not in ("fp32", "int8"):
+        raise ValueError(f"Unknown MODEL_PRECISION '{precision}'")
+    
+    name = f"{os.path.splitext(os.path.basename(weights_path))[0]}-{file_digest(weights_path)}-{precision}"
+    target = os.path.join(export_dir, name + (".onnx" if backend == "onnx" else "_openvino_model"))
+    if os.path.exists(target):
+        return target
+    
+    print(f"📦 Exporting {os.path.basename(weights_path)} to {backend} ({precision}), this only happens once...")
+    os.makedirs(export_dir, exist_ok=True)
+    
+    # Export from a private copy so ultralytics' side-by-side output doesn't touch the models folder
+    with tempfile.TemporaryDirectory(dir=export_dir) as work_dir:
+        work_weights = os.path.join(work_dir, os.path.basename(weights_path))
+        shutil.copyfile(weights_path, work_weights)
+        
+        if backend == "onnx":
+            exported = YOLO(work_weights).export(format="onnx", dynamic=True, imgsz=INFERENCE_IMGSZ)
+            if precision == "int8":
+                from onnxruntime.quantization import QuantType, quantize_dynamic
+                quantized = os.path.join(work_dir, "int8.onnx")
+                quantize_dynamic(exported, quantized, weight_type=QuantType.QUInt8)
+                exported = quantized
+        else:
+            exported = YOLO(work_weights).export(
+                format="openvino",
+                dynamic=True,
+                imgsz=INFERENCE_IMGSZ,
+                int8=precision == "int8",
+                data=MODEL_INT8_DATA if precision == "int8" else None
+            )
+        
+        os.replace(str(exported).rstrip("/"), target)
+    
+    print(f"✅ Exported model cached at {target}")
+    return target
+
+# --- Shared Preprocessing ---
+
+def preprocess_frames(frames: List[np.ndarray], imgsz: int = INFERENCE_IMGSZ):
+    """Letterbox, normalize and stack frames into one BCHW tensor for all 3 models.
+    
+    Frames are resized to fit imgsz and padded (gray 114, like ultralytics) to a
+    common stride-aligned shape, so a batch of mixed-size frames still stacks.
+    """
+    shapes = np.array([frame.shape[:2] for frame in frames], dtype=np.float32)  # (h, w)
+    gains = np.minimum(imgsz / shapes[:, 0], imgsz / shapes[:, 1])
+    new_shapes = np.round(shapes * gains[:, None]).astype(int)
+    
+    # Smallest stride-aligned canvas that fits every frame in the batch
+    out_h, out_w = (np.ceil(new_shapes.max(axis=0) / MODEL_STRIDE) * MODEL_STRIDE).astype(int)
+    pads = np.stack([(out_w - new_shapes[:, 1]) // 2, (out_h - new_shapes[:, 0]) // 2], axis=1)
+    
+    canvas = np.full((len(frames), out_h, out_w, 3), 114, dtype=np.uint8)
+    for i, frame in enumerate(frames):
+        new_h, new_w = new_shapes[i]
+        left, top = pads[i]
+        if (new_h, new_w) != frame.shape[:2]:
+            frame = cv2.resize(frame, (int(new_w), int(new_h)), interpolation=cv2.INTER_LINEAR)
+        canvas[i, top:top + new_h, left:left + new_w] = frame
+    
+    import torch
+    
+    # BGR HWC uint8 -> RGB CHW float in [0, 1]
+    tensor = torch.from_numpy(np.ascontiguousarray(canvas[..., ::-1].transpose(0, 3, 1, 2)))
+    tensor = tensor.float().div_(255.0)
+    
+    return tensor, {"gains": gains, "pads": pads.astype(np.float32)}
+
+def restore_results(results, frames: List[np.ndarray], letterbox: Dict):
+    """Rescale a model's boxes from tensor space back to each original frame"""
+    import torch
+    
+    for result, frame, gain, pad in zip(results, frames, letterbox["gains"], letterbox["pads"]):
+        boxes = result.boxes.data.clone()
+        offset = torch.from_numpy(np.tile(pad, 2)).to(boxes.device)
+        boxes[:, :4] = (boxes[:, :4] - offset) / float(gain)
+        # Plot on the original frame instead of the letterboxed tensor
+        result.orig_img = frame
+        result.orig_shape = frame.shape[:2]
+        result.update(boxes=boxes)
+
+# --- Inference Worker Pool ---
+
+class InferenceQueueFull(Exception):
+    """Raised when the inference pool has no room for another job"""
+    pass
+
+class InferenceExecutor:
+    """Bounded thread pool that keeps blocking inference off the asyncio event loop"""
+    
+    def __init__(self, workers: int, queue_size: int, name: str = "inference"):
+        self.name = name
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.executor = None
+        self.pending = 0  # queued + running jobs
+        self.running = 0
+        self.lock = threading.Lock()
+    
+    def start(self):
+        if self.executor is None:
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+            print(f"⚡ {self.name.capitalize()} pool started ({self.workers} workers, queue size {self.queue_size})")
+    
+    def shutdown(self):
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+    
+    @property
+    def queue_depth(self) -> int:
+        """Jobs accepted but still waiting for a worker"""
+        return self.pending - self.running
+    
+    def stats(self) -> Dict:
+        return {
+            "workers": self.workers,
+            "running": self.running,
+            "queue_depth": self.queue_depth,
+            "queue_size": self.queue_size
+        }
+    
+    def _wrap(self, func, args, kwargs):
+        with self.lock:
+            self.running += 1
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self.lock:
+                self.running -= 1
+    
+    def _release(self, _future):
+        # Done callback: also runs when a queued job is cancelled before _wrap starts
+        with self.lock:
+            self.pending -= 1
+    
+    async def run(self, func, *args, **kwargs):
+        """Run func on the pool and await its result, or raise InferenceQueueFull"""
+        if self.executor is None:
+            raise RuntimeError(f"{self.name.capitalize()} pool not started")
+        
+        with self.lock:
+            if self.pending >= self.workers + self.queue_size:
+                raise InferenceQueueFull(f"{self.name.capitalize()} queue is full")
+            self.pending += 1
+        
+        try:
+            future = self.executor.submit(self._wrap, func, args, kwargs)
+        except Exception:
+            with self.lock:
+                self.pending -= 1
+            raise
+        future.add_done_callback(self._release)
+        
+        return await asyncio.wrap_future(future)
+
+# --- Live Micro-Batching ---
+
+class LiveBatchScheduler:
+    """Groups live frames from all WebSocket sessions into batched inference calls"""
+    
+    def __init__(self, max_batch_size: int, max_wait_ms: float):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.queue = None
+        self.task = None
+        self.inflight = set()
+        self.batches = 0
+        self.frames = 0
+    
+    def start(self):
+        self.queue = asyncio.Queue()
+        self.task = asyncio.create_task(self._collect())
+    
+    async def stop(self):
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, *self.inflight, return_exceptions=True)
+            self.task = None
+    
+    def stats(self) -> Dict:
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000,
+            "batches": self.batches,
+            "frames": self.frames,
+            "avg_batch_size": round(self.frames / self.batches, 2) if self.batches else 0
+        }
+    
+    async def submit(self, contents, confidence: float, annotate: bool = True, imgsz: int = LIVE_IMGSZ, scale: float = 1.0):
+        """Queue one frame (encoded, or decoded with its downscale factor) and wait for its detections"""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((contents, confidence, annotate, imgsz, scale, future))
+        return await future
+    
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_wait
             
-            all_detections["traffic_lights"].append({
-                "bbox": [int(x1), int(y1), int(x2), int(y2)],
-                "confidence": conf,
-                "class_id": cls,
-                "label": label,
-                "color": label  # green/red/yellow
-            })
-        
-        annotated_image = results_lights[0].plot(img=annotated_image)
-        print(f"✅ Step 2: {len(all_detections['traffic_lights'])} traffic lights detected")
-        
-        # --- STEP 3: Run Zebra Crossing Model (class 8 = zebra crossing)
-        zebra_classes_to_keep = [8]
-        print("⚙️ Running Zebra Crossing model...")
-        results_zebra = self.model_zebra.predict(image, classes=zebra_classes_to_keep, conf=conf_threshold, verbose=False)
+            # Keep collecting until the batch is full or the wait window closes
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Run the batch in the background so the next one can start collecting
+            task = asyncio.create_task(self._dispatch(batch))
+            self.inflight.add(task)
+            task.add_done_callback(self.inflight.discard)
+    
+    async def _dispatch(self, batch: List[tuple]):
+        # Drop frames whose sockets already went away
+        batch = [item for item in batch if not item[-1].done()]
+        if not batch:
+            return
+        
+        self.batches += 1
+        self.frames += len(batch)
+        
+        try:
+            outputs = await inference_pool.run(run_batch_detection, [item[:-1] for item in batch])
+        except Exception as e:
+            for *_, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
         
-        for box in results_zebra[0].boxes:
-            x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-            conf = float(box.conf[0])
-            cls = int(box.cls[0])
+        for (*_, future), detections in zip(batch, outputs):
+            if not future.done():
+                future.set_result(detections)
+
+# --- Text Generation Engine ---
+
+class TextGenerationEngine:
+    """Batched, memoized Flan-T5 generation shared by all requests.
+    
+    Sentences from any thread are queued, grouped by decoding mode and generated together
+    on one background thread. Outputs are memoized, since the template describer produces
+    a small, repetitive set of sentences.
+    """
+    
+    PROMPT = "Convert this instruction into a polite, natural sentence: {}"
+    
+    def __init__(self, max_batch_size: int, max_wait_ms: float, cache_size: int, timeout: float):
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.cache_size = cache_size
+        self.timeout = timeout
+        self.cache = OrderedDict()
+        self.tokenizer = None
+        self.model = None
+        self.backend = None
+        self.queue = queue.Queue()
+        self.thread = None
+        self.lock = threading.Lock()
+        self.counts = Counter()
+    
+    @property
+    def ready(self) -> bool:
+        return self.model is not None
+    
+    def load(self, model_name: str, backend: str):
+        """Load tokenizer + model for the requested backend and start the batching thread"""
+        import torch
+        from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+        
+        tokenizer = AutoTokenizer.from_pretrained(model_name)
+        
+        if backend == "onnx":
+            try:
+                from optimum.onnxruntime import ORTModelForSeq2SeqLM
+                model = ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True)
+            except ImportError:
+                print("⚠️ optimum[onnxruntime] is not installed, using int8 PyTorch for Flan-T5")
+                backend = "int8"
+        
+        if backend in ("torch", "int8"):
+            model = AutoModelForSeq2SeqLM.from_pretrained(model_name).eval()
+            if backend == "int8":
+                # Dynamic int8 quantization of the Linear layers: ~2-3x faster decoding on CPU
+                model = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+        elif backend != "onnx":
+            raise ValueError(f"Unknown LLM_BACKEND '{backend}'")
+        
+        self.tokenizer, self.model, self.backend = tokenizer, model, backend
+        if self.thread is None:
+            self.thread = threading.Thread(target=self._run, name="text-engine", daemon=True)
+            self.thread.start()
+        return tokenizer, model
+    
+    def stats(self) -> Dict:
+        with self.lock:
+            return {"backend": self.backend, "cached": len(self.cache), **self.counts}
+    
+    def submit(self, text: str, fast: bool = False) -> Future:
+        """Future for the polite version of one sentence"""
+        key = (text, fast)
+        with self.lock:
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.cache.move_to_end(key)
+                self.counts["memo_hits"] += 1
+        
+        future = Future()
+        if cached is not None or not self.ready:
+            future.set_result(cached if cached is not None else text)
+            return future
+        
+        self.queue.put((text, fast, future))
+        return future
+    
+    def polish(self, sentences: List[str], fast: bool = False) -> List[str]:
+        """Blocking batch generation (worker threads); sentences not ready within LLM_TIMEOUT are kept as is"""
+        futures = [self.submit(text, fast) for text in sentences]
+        deadline = time.monotonic() + self.timeout
+        results = []
+        for text, future in zip(sentences, futures):
+            try:
+                results.append(future.result(timeout=max(0.0, deadline - time.monotonic())))
+            except FutureTimeoutError:
+                future.cancel()
+                with self.lock:
+                    self.counts["timeouts"] += 1
+                results.append(text)
+        return results
+    
+    async def polish_async(self, sentences: List[str], fast: bool = False) -> List[str]:
+        """Batch generation without blocking the event loop"""
+        futures = [asyncio.wrap_future(self.submit(text, fast)) for text in sentences]
+        return list(await asyncio.gather(*futures))
+    
+    @staticmethod
+    def _resolve(future: Future, value: str):
+        # Waiters that gave up (e.g. a cancelled polish_async) have cancelled their future
+        if future.done():
+            return
+        if future.running() or future.set_running_or_notify_cancel():
+            future.set_result(value)
+    
+    def _run(self):
+        while True:
+            batch = [self.queue.get()]
+            deadline = time.monotonic() + self.max_wait
             
-            all_detections["zebra_crossings"].append({
-                "bbox": [int(x1), int(y1), int(x2), int(y2)],
-                "confidence": conf,
-                "class_id": cls,
-                "label": "zebra_crossing"
-            })
+            # Collect until the batch is full or the wait window closes
+            while len(batch) < self.max_batch_size:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self.queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            
+            try:
+                for fast in (True, False):
+                    group = [item for item in batch if item[1] == fast]
+                    if group:
+                        self._generate(group, fast)
+            except Exception as e:
+                # One bad batch must not stop the engine thread; its waiters keep their original sentence
+                print(f"⚠️ Text engine error: {e}")
+                for text, _, future in batch:
+                    self._resolve(future, text)
+    
+    def _generate(self, group: List[tuple], fast: bool):
+        # Identical sentences in one batch are generated once
+        texts = list(dict.fromkeys(text for text, _, _ in group))
         
-        final_annotated_image = results_zebra[0].plot(img=annotated_image)
-        print(f"✅ Step 3: {len(all_detections['zebra_crossings'])} zebra crossings detected")
+        try:
+            inputs = self.tokenizer([self.PROMPT.format(text) for text in texts], return_tensors="pt", padding=True)
+            decoding = (
+                {"max_length": LLM_FAST_MAX_LENGTH, "num_beams": 1, "do_sample": False}
+                if fast else
+                {"max_length": LLM_MAX_LENGTH, "num_beams": LLM_NUM_BEAMS, "early_stopping": True, "no_repeat_ngram_size": 2}
+            )
+            import torch
+            with torch.inference_mode(), metrics.timer("llm_generate"):
+                outputs = self.model.generate(**inputs, **decoding)
+            generated = self.tokenizer.batch_decode(outputs, skip_special_tokens=True)
+        except Exception as e:
+            print(f"⚠️ LLM generation error: {e}")
+            generated = texts
         
-        all_detections["annotated_image"] = final_annotated_image
+        results = {text: output.strip() or text for text, output in zip(texts, generated)}
+        with self.lock:
+            self.counts["batches"] += 1
+            self.counts["generated"] += len(texts)
+            for text, output in results.items():
+                self.cache[(text, fast)] = output
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
         
-        return all_detections
+        for text, _, future in group:
+            self._resolve(future, results[text])
 
 # Initialize model manager
+text_engine = TextGenerationEngine(LLM_MAX_BATCH, LLM_BATCH_WAIT_MS, LLM_CACHE_SIZE, LLM_TIMEOUT)
 model_manager = ModelManager()
+inference_pool = InferenceExecutor(INFERENCE_WORKERS, INFERENCE_QUEUE_SIZE)
+video_pool = InferenceExecutor(VIDEO_WORKERS, VIDEO_QUEUE_SIZE, name="video")
+live_scheduler = LiveBatchScheduler(LIVE_BATCH_SIZE, LIVE_BATCH_WAIT_MS)
+
+def busy_response():
+    """503 response used when the inference queue is full"""
+    return JSONResponse(
+        status_code=503,
+        content={"error": "Server is busy. Please retry shortly."},
+        headers={"Retry-After": "1"}
+    )
+
+def models_not_ready_response():
+    """503 response used while the YOLO models are still loading (or failed to load)"""
+    if model_manager.loading:
+        return JSONResponse(
+            status_code=503,
+            content={"error": "Models are still loading. Please retry shortly."},
+            headers={"Retry-After": "5"}
+        )
+    return JSONResponse(
+        status_code=503,
+        content={"error": "Models not loaded. Please check server logs."}
+    )
+
+def run_image_detection(contents: bytes, confidence: float, annotate: bool = True, imgsz: Optional[int] = None):
+    """Decode, detect and JPEG-encode one image (runs on the inference pool)"""
+    return run_batch_detection([(contents, confidence, annotate, imgsz or IMAGE_IMGSZ)])[0]
+
+def resolve_imgsz(requested: Optional[int], default: int) -> int:
+    """Per-request inference size, rounded up to the model stride and kept in a sane range"""
+    if not requested:
+        return default
+    imgsz = min(max(int(requested), 160), 1920)
+    return int(np.ceil(imgsz / MODEL_STRIDE) * MODEL_STRIDE)
+
+def decode_image(contents: bytes) -> Optional[np.ndarray]:
+    """Decode encoded image bytes to a BGR frame (None if invalid)"""
+    return cv2.imdecode(np.frombuffer(contents, np.uint8), cv2.IMREAD_COLOR)
+
+REDUCED_DECODE_FLAGS = {2: cv2.IMREAD_REDUCED_COLOR_2, 4: cv2.IMREAD_REDUCED_COLOR_4, 8: cv2.IMREAD_REDUCED_COLOR_8}
+
+def decode_image_scaled(contents: bytes, imgsz: int = INFERENCE_IMGSZ):
+    """Decode an image, at reduced resolution when it is much larger than needed.
+    
+    Returns (frame, scale) where scale maps frame coordinates back to the original
+    image, or (None, 1.0) if invalid. JPEGs are downscaled inside the decoder (DCT
+    scaling), which is several times faster than decoding at full size and resizing.
+    """
+    with metrics.timer("decode"):
+        return _decode_image_scaled(contents, imgsz)
+
+def _decode_image_scaled(contents: bytes, imgsz: int):
+    factor = 1
+    if DECODE_MIN_SIDE > 0:
+        try:
+            # Only reads the header
+            with Image.open(io.BytesIO(contents)) as header:
+                long_side = max(header.size)
+        except Exception:
+            long_side = 0
+        target = max(imgsz, DECODE_MIN_SIDE)
+        factor = next((f for f in (8, 4, 2) if long_side / f >= target), 1)
+    
+    if factor == 1:
+        return decode_image(contents), 1.0
+    
+    frame = cv2.imdecode(np.frombuffer(contents, np.uint8), REDUCED_DECODE_FLAGS[factor])
+    if frame is None:
+        return None, 1.0
+    return frame, long_side / max(frame.shape[:2])
+
+def run_batch_detection(items: List[tuple]):
+    """Decode, detect and JPEG-encode a batch of (image, confidence, annotate, imgsz[, scale]) items.
+    
+    Images are encoded bytes or already-decoded frames; scale maps a decoded frame that
+    was downscaled back to its original size. Oversized encoded images are decoded at
+    reduced resolution. Frames sharing the same options go through the 3 models as one
+    batch. Boxes ("detections", a Detections container) and "frame_size" are in original
+    image coordinates (the annotated image stays at the decoded resolution). Returns one
+    dict per item, or None where the image could not be decoded.
+    """
+    images, scales = [], []
+    for contents, _, _, imgsz, *scale in items:
+        if isinstance(contents, np.ndarray):
+            image, image_scale = contents, (scale[0] if scale else 1.0)
+        else:
+            image, image_scale = decode_image_scaled(contents, imgsz)
+        images.append(image)
+        scales.append(image_scale)
+    outputs = [None] * len(items)
+    
+    groups = {}
+    for index, (image, (_, confidence, annotate, imgsz, *_)) in enumerate(zip(images, items)):
+        if image is not None:
+            groups.setdefault((confidence, annotate, imgsz), []).append(index)
+    
+    for (confidence, annotate, imgsz), indices in groups.items():
+        # Run all 3 models
+        batch = model_manager.detect_batch([images[i] for i in indices], confidence, annotate, imgsz)
+        
+        for index, detections in zip(indices, batch):
+            image, scale = images[index], scales[index]
+            # Convert annotated image to base64 (boxes-only responses skip this entirely)
+            if annotate:
+                with metrics.timer("imencode"):
+                    _, buffer = cv2.imencode('.jpg', detections["annotated_image"])
+                with metrics.timer("base64"):
+                    detections["annotated_base64"] = base64.b64encode(buffer).decode('utf-8')
+            detections["detections"] = detections["detections"].scaled(scale)
+            detections["frame_size"] = (round(image.shape[1] * scale), round(image.shape[0] * scale))
+            outputs[index] = detections
+    
+    return outputs
+
+# --- Scene-Change Gate ---
+
+# Totals across all gates, reported by /health
+scene_gate_totals = Counter()
+
+class SceneChangeGate:
+    """Cheap frame-difference gate in front of detect_all.
+    
+    Frames are compared (downscaled, grayscale) with the last frame that actually ran
+    the models, so slow drift still triggers inference once it adds up.
+    A traffic light changing colour barely moves the grayscale difference, so the mean
+    colour inside the last result's traffic light boxes (see record()) is compared as well.
+    """
+    
+    def __init__(
+        self,
+        source: str,
+        threshold: float = SCENE_CHANGE_THRESHOLD,
+        max_reuse: int = SCENE_MAX_REUSE,
+        max_reuse_seconds: float = SCENE_MAX_REUSE_SECONDS,
+        light_threshold: float = SCENE_LIGHT_THRESHOLD
+    ):
+        self.source = source
+        self.threshold = threshold
+        self.max_reuse = max_reuse
+        self.max_reuse_seconds = max_reuse_seconds
+        self.light_threshold = light_threshold
+        self.reference = None
+        self.reference_time = 0.0
+        # Traffic light boxes of the last result (frame coordinates) and their mean BGR colour
+        self.light_boxes = []
+        self.light_colors = None
+        self.reused_in_row = 0
+        self.checked = 0
+        self.skipped = 0
+    
+    @staticmethod
+    def thumbnail(frame: np.ndarray) -> np.ndarray:
+        small = cv2.resize(frame, (64, 36), interpolation=cv2.INTER_AREA)
+        return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY).astype(np.int16)
+    
+    @staticmethod
+    def box_colors(frame: np.ndarray, boxes: List[tuple]) -> np.ndarray:
+        """Mean BGR colour inside each box"""
+        return np.array([frame[y1:y2, x1:x2].mean(axis=(0, 1)) for x1, y1, x2, y2 in boxes], dtype=np.float32)
+    
+    def record(self, detections: Detections, frame: np.ndarray, scale: float = 1.0):
+        """Remember the traffic lights of the last inferred frame.
+        
+        scale maps frame coordinates to the detections' coordinates (see decode_image_scaled).
+        """
+        height, width = frame.shape[:2]
+        xyxy = np.round(detections.group(Detections.TRAFFIC_LIGHTS).xyxy / scale).astype(int)
+        xyxy[:, [0, 2]] = np.clip(xyxy[:, [0, 2]], 0, width)
+        xyxy[:, [1, 3]] = np.clip(xyxy[:, [1, 3]], 0, height)
+        self.light_boxes = [tuple(box) for box in xyxy.tolist() if box[2] > box[0] and box[3] > box[1]]
+        self.light_colors = self.box_colors(frame, self.light_boxes) if self.light_boxes else None
+    
+    def lights_changed(self, frame: np.ndarray) -> bool:
+        if self.light_colors is None or self.light_threshold <= 0:
+            return False
+        colors = self.box_colors(frame, self.light_boxes)
+        return bool(np.abs(colors - self.light_colors).max() >= self.light_threshold)
+    
+    def should_infer(self, frame: np.ndarray, force: bool = False, now: Optional[float] = None) -> bool:
+        """True if the frame must run the models, False if previous detections can be reused.
+        
+        now is the frame time in seconds (default: monotonic clock), used for SCENE_MAX_REUSE_SECONDS.
+        """
+        self.checked += 1
+        scene_gate_totals[f"{self.source}_checked"] += 1
+        thumbnail = self.thumbnail(frame)
+        if now is None:
+            now = time.monotonic()
+        
+        if (
+            not force
+            and self.threshold > 0
+            and self.reference is not None
+            and self.reused_in_row < self.max_reuse
+            and now - self.reference_time < self.max_reuse_seconds
+            and np.abs(thumbnail - self.reference).mean() < self.threshold
+            and not self.lights_changed(frame)
+        ):
+            self.reused_in_row += 1
+            self.skipped += 1
+            scene_gate_totals[f"{self.source}_skipped"] += 1
+            return False
+        
+        self.reference = thumbnail
+        self.reference_time = now
+        self.reused_in_row = 0
+        return True
+
+# --- Object Tracking ---
+
+TRACKED_GROUPS = ("objects", "traffic_lights", "zebra_crossings")
+
+def box_iou(boxes_a: np.ndarray, boxes_b: np.ndarray) -> np.ndarray:
+    """Pairwise IoU between (N, 4) and (M, 4) xyxy boxes"""
+    top_left = np.maximum(boxes_a[:, None, :2], boxes_b[None, :, :2])
+    bottom_right = np.minimum(boxes_a[:, None, 2:], boxes_b[None, :, 2:])
+    intersection = np.clip(bottom_right - top_left, 0, None).prod(axis=2)
+    area_a = (boxes_a[:, 2:] - boxes_a[:, :2]).prod(axis=1)
+    area_b = (boxes_b[:, 2:] - boxes_b[:, :2]).prod(axis=1)
+    return intersection / np.maximum(area_a[:, None] + area_b[None, :] - intersection, 1e-6)
+
+class IoUTracker:
+    """Lightweight IoU tracker with constant-velocity box prediction.
+    
+    update() runs on frames that went through the models and gives every detection a
+    persistent "track_id"; predict() extrapolates live tracks onto the frames in between.
+    """
+    
+    def __init__(self, iou_threshold: float = TRACKER_IOU_THRESHOLD, max_misses: int = TRACKER_MAX_MISSES):
+        self.iou_threshold = iou_threshold
+        self.max_misses = max_misses
+        self.tracks = []
+        self.next_id = 1
+        # Every track ever created: id -> (group, label), for whole-video counts
+        self.history = {}
+    
+    def _predicted_box(self, track: Dict, frame_index: int) -> np.ndarray:
+        return track["box"] + track["velocity"] * (frame_index - track["frame"])
+    
+    def update(self, detections: Dict, frame_index: int):
+        """Match a frame's detections to existing tracks (same group and label, greedy by IoU)"""
+        matched_tracks = set()
+        
+        for group in TRACKED_GROUPS:
+            for label in {d["label"] for d in detections.get(group, [])}:
+                group_detections = [d for d in detections[group] if d["label"] == label]
+                candidates = [t for t in self.tracks if t["group"] == group and t["label"] == label]
+                boxes = np.array([d["bbox"] for d in group_detections], dtype=np.float32)
+                
+                pairs = []
+                if candidates:
+                    predicted = np.stack([self._predicted_box(t, frame_index) for t in candidates])
+                    ious = box_iou(boxes, predicted)
+                    pairs = sorted(zip(*np.nonzero(ious >= self.iou_threshold)), key=lambda p: -ious[p])
+                    
+                    # Fallback for fast movers with little overlap between samples: centre distance
+                    # within one predicted box diagonal (checked after all IoU matches)
+                    centres = (boxes[:, None, :2] + boxes[:, None, 2:]) / 2
+                    predicted_centres = (predicted[None, :, :2] + predicted[None, :, 2:]) / 2
+                    diagonals = np.linalg.norm(predicted[:, 2:] - predicted[:, :2], axis=1)
+                    distances = np.linalg.norm(centres - predicted_centres, axis=2) / np.maximum(diagonals, 1e-6)
+                    pairs += sorted(zip(*np.nonzero(distances <= 1.0)), key=lambda p: distances[p])
+                
+                used_detections = set()
+                for det_index, track_index in pairs:
+                    track = candidates[track_index]
+                    if det_index in used_detections or id(track) in matched_tracks:
+                        continue
+                    used_detections.add(det_index)
+                    matched_tracks.add(id(track))
+                    
+                    # Per-frame velocity since the track was last seen
+                    gap = max(1, frame_index - track["frame"])
+                    track["velocity"] = (boxes[det_index] - track["box"]) / gap
+                    track.update(box=boxes[det_index], frame=frame_index, misses=0, class_id=group_detections[det_index]["class_id"])
+                    group_detections[det_index]["track_id"] = track["id"]
+                
+                for det_index, detection in enumerate(group_detections):
+                    if det_index in used_detections:
+                        continue
+                    track = {
+                        "id": self.next_id,
+                        "group": group,
+                        "label": label,
+                        "class_id": detection["class_id"],
+                        "box": boxes[det_index],
+                        "velocity": np.zeros(4, dtype=np.float32),
+                        "frame": frame_index,
+                        "misses": 0
+                    }
+                    self.next_id += 1
+                    self.tracks.append(track)
+                    self.history[track["id"]] = (group, label)
+                    matched_tracks.add(id(track))
+                    detection["track_id"] = track["id"]
+        
+        # Age out tracks that were not seen on this frame
+        for track in self.tracks:
+            if id(track) not in matched_tracks:
+                track["misses"] += 1
+        self.tracks = [t for t in self.tracks if t["misses"] <= self.max_misses]
+    
+    def predict(self, frame_index: int) -> List[Dict]:
+        """Boxes of the tracks seen on the last update, moved to frame_index"""
+        return [
+            {
+                "track_id": t["id"],
+                "label": t["label"],
+                "class_id": t["class_id"],
+                "bbox": self._predicted_box(t, frame_index)
+            }
+            for t in self.tracks if t["misses"] == 0
+        ]
+    
+    def counts(self) -> Dict:
+        """Unique tracks per label over everything seen so far"""
+        counts = {group: Counter() for group in TRACKED_GROUPS}
+        for group, label in self.history.values():
+            counts[group][label] += 1
+        return {
+            "objects": dict(counts["objects"]),
+            "traffic_lights": dict(counts["traffic_lights"]),
+            "zebra_crossings": sum(counts["zebra_crossings"].values()),
+            "total": len(self.history)
+        }
+
+def draw_tracks(frame: np.ndarray, tracks: List[Dict]) -> np.ndarray:
+    """Draw predicted track boxes in the same palette as ultralytics plot()"""
+    from ultralytics.utils.plotting import Annotator, colors
+    
+    annotator = Annotator(frame)
+    for track in tracks:
+        annotator.box_label(track["bbox"], f"{track['label']} #{track['track_id']}", color=colors(track["class_id"], True))
+    return annotator.result()
+
+def pipeline_put(stage_queue: queue.Queue, item, stop: threading.Event) -> bool:
+    """Put into a bounded pipeline queue, giving up if the pipeline is stopping"""
+    while not stop.is_set():
+        try:
+            stage_queue.put(item, timeout=0.1)
+            return True
+        except queue.Full:
+            continue
+    return False
+
+def pipeline_get(stage_queue: queue.Queue, stop: threading.Event):
+    """Get from a pipeline queue; returns None (end of stream) if the pipeline is stopping"""
+    while not stop.is_set():
+        try:
+            return stage_queue.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return None
+
+def process_video_file(
+    input_path: str,
+    output_path: Optional[str],
+    confidence: float,
+    sample_rate: int,
+    progress: Optional[Callable[[int, int, int], None]] = None,
+    imgsz: Optional[int] = None
+):
+    """Run detection over a video file and write the annotated video (runs on the video pool or a video job worker).
+    
+    With output_path=None only detections are produced (no annotation, no writer).
+    progress(frames_done, total_frames, processed_frames) is called after every batch.
+    
+    Decoding, inference and encoding run as a 3-stage pipeline: a decoder thread,
+    this thread and a writer thread joined by bounded queues. Each stage is a single
+    thread, so frame order is preserved while decode/encode overlap with the models.
+    Sampled frames are collected into batches of VIDEO_BATCH_SIZE for one batched
+    predict per model; the frames in between are held back until their batch is done
+    (at most VIDEO_MAX_PENDING_FRAMES, after which the partial batch is run early).
+    Sampled frames that barely differ from the last inferred one (SceneChangeGate)
+    are treated like the frames in between and skip the models.
+    An IoUTracker follows objects across samples: frames in between get the tracks'
+    predicted boxes drawn on them, and the summary counts unique tracks for the whole video.
+    """
+    # Open video
+    cap = cv2.VideoCapture(input_path)
+    
+    # Get video properties
+    fps = int(cap.get(cv2.CAP_PROP_FPS)) or 30
+    width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    
+    # Video writer for annotated output
+    annotate = output_path is not None
+    # Frames between samples only need decoding when tracked boxes are drawn on them
+    track_skipped = annotate and VIDEO_TRACK_SKIPPED_FRAMES
+    tracker = IoUTracker()
+    scene_gate = SceneChangeGate("video")
+    if annotate:
+        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
+        out = cv2.VideoWriter(output_path, fourcc, fps, (width, height))
+    
+    decoded_frames = queue.Queue(maxsize=VIDEO_PIPELINE_QUEUE_SIZE)
+    output_frames = queue.Queue(maxsize=VIDEO_PIPELINE_QUEUE_SIZE)
+    stop = threading.Event()
+    errors = []
+    
+    def decode_frames():
+        index = 0
+        try:
+            while not stop.is_set():
+                if index % sample_rate == 0 or track_skipped:
+                    ret, frame = cap.read()
+                else:
+                    # Unsampled frames are never analysed or shown (the last annotated frame
+                    # is written instead), so grab() them: no BGR conversion, no frame copy
+                    ret, frame = cap.grab(), None
+                if not ret:
+                    break
+                if not pipeline_put(decoded_frames, (index, frame), stop):
+                    return
+                index += 1
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+        # End of stream
+        pipeline_put(decoded_frames, None, stop)
+    
+    def write_frames():
+        try:
+            while True:
+                frame = pipeline_get(output_frames, stop)
+                if frame is None:
+                    break
+                out.write(frame)
+        except Exception as e:
+            errors.append(e)
+            stop.set()
+    
+    decoder = threading.Thread(target=decode_frames, name="video-decoder", daemon=True)
+    writer = threading.Thread(target=write_frames, name="video-writer", daemon=True) if annotate else None
+    decoder.start()
+    if writer:
+        writer.start()
+    
+    frame_count = 0
+    processed_count = 0
+    batch_size = max(1, VIDEO_BATCH_SIZE)
+    max_pending = max(1, VIDEO_MAX_PENDING_FRAMES)
+    state = {"last_annotated": None}
+    
+    # Store the LAST processed frame's detections for final summary
+    # (We don't want to sum across all frames - that inflates counts!)
+    latest = {"objects": [], "traffic_lights": [], "zebra_crossings": [], "detections": Detections.empty()}
+    
+    # Frames waiting for their batch: (frame index, frame, is_sampled)
+    pending = []
+    
+    def flush_batch() -> bool:
+        """Run the sampled frames in `pending` as one batch and emit all pending frames in order"""
+        sampled = [frame for _, frame, is_sampled in pending if is_sampled]
+        if sampled:
+            print(f"Processing frames {frame_count - len(pending)}-{frame_count - 1}/{total_frames} ({len(sampled)} sampled)...")
+            batch = iter(model_manager.detect_batch(sampled, confidence, annotate, imgsz or VIDEO_IMGSZ))
+        
+        for index, frame, is_sampled in pending:
+            if is_sampled:
+                detections = next(batch)
+                groups = detections["detections"].to_dict()
+                tracker.update(groups, index)
+                scene_gate.record(detections["detections"], frame)
+                
+                # Update to LATEST frame's detections (replaces previous, not extends)
+                latest.update(groups, detections=detections["detections"])
+                
+                # Cache the last annotated frame for skipped frames
+                state["last_annotated"] = detections["annotated_image"]
+                output_frame = detections["annotated_image"]
+            elif track_skipped:
+                # Move tracked boxes along their velocity instead of freezing the video
+                output_frame = draw_tracks(frame, tracker.predict(index))
+            else:
+                # For skipped frames, write the last annotated frame to maintain smooth video
+                output_frame = state["last_annotated"]
+            
+            if writer and not pipeline_put(output_frames, output_frame, stop):
+                return False
+        
+        pending.clear()
+        if progress:
+            progress(frame_count, total_frames, processed_count)
+        return True
+    
+    pending_sampled = 0
+    
+    try:
+        # Process video with memory efficiency
+        while True:
+            item = pipeline_get(decoded_frames, stop)
+            if item is None:
+                break
+            
+            # Process every Nth frame for detection (unless the scene is unchanged), but write all frames
+            index, frame = item
+            is_sampled = frame_count % sample_rate == 0 and scene_gate.should_infer(frame, now=index / fps)
+            if is_sampled:
+                processed_count += 1
+                pending_sampled += 1
+            pending.append((index, frame, is_sampled))
+            frame_count += 1
+            
+            # Batch is complete once it holds batch_size sampled frames and the next frame starts a new sample.
+            # Held-back frames are full decoded images (track_skipped) or pile up while the scene gate
+            # skips samples, so a partial batch is also run once max_pending frames are waiting
+            if (pending_sampled >= batch_size and frame_count % sample_rate == 0) or len(pending) >= max_pending:
+                pending_sampled = 0
+                if not flush_batch():
+                    break
+            
+            # Memory management: Force garbage collection every 100 frames
+            if frame_count % 100 == 0:
+                import gc
+                gc.collect()
+        
+        # Remaining partial batch at end of stream
+        if pending and not stop.is_set():
+            flush_batch()
+    except Exception:
+        stop.set()
+        raise
+    finally:
+        # Let the writer drain, then release resources
+        if writer:
+            pipeline_put(output_frames, None, stop)
+            writer.join()
+        stop.set()
+        decoder.join()
+        cap.release()
+        if annotate:
+            out.release()
+    
+    latest_objects = latest["objects"]
+    latest_lights = latest["traffic_lights"]
+    latest_zebra = latest["zebra_crossings"]
+    
+    if errors:
+        raise errors[0]
+    
+    print(f"✅ Video processing complete: {frame_count} frames, {processed_count} processed")
+    print(f"📊 Latest frame detections: {len(latest_objects)} objects, {len(latest_lights)} lights, {len(latest_zebra)} zebra crossings")
+    
+    return {
+        "objects": latest_objects,
+        "traffic_lights": latest_lights,
+        "zebra_crossings": latest_zebra,
+        # Columnar latest-frame detections for the voice description
+        "detections": latest["detections"],
+        "width": width,
+        "height": height,
+        # Unique objects over the whole video (latest_* only describe the last sampled frame)
+        "track_counts": tracker.counts(),
+        "video_info": {
+            "total_frames": frame_count,
+            "processed_frames": processed_count,
+            # Sampled frames that reused detections because the scene had not changed
+            "scene_skipped_frames": scene_gate.skipped,
+            "fps": fps,
+            # Calculate video duration
+            "duration": frame_count / fps if fps > 0 else 0
+        }
+    }
 
 @app.get("/")
 async def root():
@@ -230,26 +1892,95 @@ async def root():
             "detect": "/api/detect (Auto-detect image/video)",
             "detect_image": "/api/detect/image",
             "detect_video": "/api/detect/video",
-            "live_detection": "/api/detect/live (WebSocket)"
+            "live_detection": "/api/detect/live (WebSocket)",
+            "annotated_video": "/api/videos/{video_id}",
+            "video_jobs": "/api/jobs/video (submit), /api/jobs/{job_id} (status), /api/jobs/{job_id}/result"
         }
     }
 
 @app.get("/health")
 async def health_check():
     return {
-        "status": "healthy" if model_manager.models_loaded else "models_not_loaded",
-        "models": {
-            "yolov8m": model_manager.model_yolo is not None,
-            "traffic_lights": model_manager.model_lights is not None,
-            "zebra_crossing": model_manager.model_zebra is not None
-        }
+        "status": "healthy" if model_manager.models_loaded else ("loading" if model_manager.loading else "models_not_loaded"),
+        # Per model: state (pending/loading/ready/failed) and load_seconds
+        "models": model_manager.status_report(),
+        "warmup": model_manager.warmup_status,
+        "light_cascade": dict(model_manager.cascade_stats) if LIGHT_CASCADE else "disabled",
+        "model_backend": model_manager.backend,
+        "inference": inference_pool.stats(),
+        "video_pool": video_pool.stats(),
+        "live_batching": live_scheduler.stats(),
+        "scene_gate": dict(scene_gate_totals),
+        "video_jobs": video_jobs.stats(),
+        "description_cache": description_cache.stats(),
+        "image_cache": image_cache.stats(),
+        "gemini": gemini_service.stats(),
+        "text_engine": text_engine.stats()
     }
 
+def collect_runtime_metrics() -> List[tuple]:
+    """Gauges and counters read from the components' stats at scrape time"""
+    samples = [
+        ("myvision_models_loaded", "gauge", "1 once the YOLO models are loaded and warmed up", {}, int(model_manager.models_loaded)),
+        ("myvision_inference_queue_depth", "gauge", "Inference pool jobs waiting for a worker", {}, inference_pool.queue_depth),
+        ("myvision_inference_running", "gauge", "Inference pool jobs running", {}, inference_pool.running),
+        ("myvision_video_queue_depth", "gauge", "Video pool jobs waiting for a worker", {}, video_pool.queue_depth),
+        ("myvision_video_running", "gauge", "Video pool jobs running", {}, video_pool.running),
+        ("myvision_live_batch_queue_depth", "gauge", "Live frames waiting to be batched", {},
+         live_scheduler.queue.qsize() if live_scheduler.queue else 0),
+        ("myvision_live_batches_total", "counter", "Live micro-batches dispatched", {}, live_scheduler.batches),
+        ("myvision_live_frames_total", "counter", "Live frames dispatched in micro-batches", {}, live_scheduler.frames)
+    ]
+    
+    for state, count in video_jobs.stats().items():
+        if state != "workers":
+            samples.append(("myvision_video_jobs", "gauge", "Video jobs by state", {"state": state}, count))
+    
+    for key, count in scene_gate_totals.items():
+        source, _, result = key.partition("_")
+        samples.append(("myvision_scene_gate_frames_total", "counter", "Frames checked / skipped by the scene-change gate",
+                        {"source": source, "result": result}, count))
+    
+    image_stats, description_stats, text_stats = image_cache.stats(), description_cache.stats(), text_engine.stats()
+    caches = {
+        "image": (image_stats.get("memory_hits", 0) + image_stats.get("disk_hits", 0), image_stats.get("misses", 0)),
+        "description": (description_stats["hits"], description_stats["misses"]),
+        "llm_memo": (text_stats.get("memo_hits", 0), text_stats.get("generated", 0))
+    }
+    for cache, (hits, misses) in caches.items():
+        samples.append(("myvision_cache_hits_total", "counter", "Cache hits", {"cache": cache}, hits))
+    for cache, (hits, misses) in caches.items():
+        samples.append(("myvision_cache_misses_total", "counter", "Cache misses", {"cache": cache}, misses))
+    for cache, (hits, misses) in caches.items():
+        samples.append(("myvision_cache_hit_ratio", "gauge", "Cache hit ratio since start", {"cache": cache},
+                        round(hits / (hits + misses), 4) if hits + misses else 0))
+    samples.append(("myvision_cache_bytes", "gauge", "Image result cache size", {"tier": "memory"}, image_stats["bytes"]))
+    if image_stats["disk_bytes"] is not None:
+        samples.append(("myvision_cache_bytes", "gauge", "Image result cache size", {"tier": "disk"}, image_stats["disk_bytes"]))
+    
+    gemini_stats = gemini_service.stats()
+    samples.append(("myvision_gemini_in_flight", "gauge", "Gemini calls in flight", {}, gemini_stats["in_flight"]))
+    for outcome in ("calls", "coalesced", "rate_limited", "timeouts"):
+        samples.append(("myvision_gemini_requests_total", "counter", "Gemini description requests by outcome",
+                        {"outcome": outcome}, gemini_stats.get(outcome, 0)))
+    return samples
+
+@app.get("/metrics")
+async def metrics_endpoint():
+    """Prometheus text exposition of latency histograms and runtime gauges"""
+    return PlainTextResponse(
+        metrics.render(collect_runtime_metrics()),
+        media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
 @app.post("/api/detect")
 async def detect_objects(
+    request: Request,
     file: UploadFile = File(...),
     confidence: float = 0.4,
-    sample_rate: int = 5
+    sample_rate: int = 5,
+    annotate: bool = True,
+    imgsz: Optional[int] = None
 ):
     """Unified endpoint: Automatically detects if file is image or video and processes accordingly"""
     # Check file type based on extension
@@ -262,69 +1993,254 @@ async def detect_objects(
     is_image = any(filename_lower.endswith(ext) for ext in image_extensions)
     
     if is_video:
-        return await detect_objects_in_video(file, confidence, sample_rate)
+        return await detect_objects_in_video(request, file, confidence, sample_rate, annotate, imgsz)
     elif is_image:
-        return await detect_objects_in_image(file, confidence)
+        return await detect_objects_in_image(file, confidence, annotate, imgsz)
     else:
         return JSONResponse(
             status_code=400,
             content={"error": "Unsupported file type. Please upload an image or video file."}
         )
 
+# --- Image Result Cache ---
+
+class ImageResultCache:
+    """Content-addressed cache of /api/detect/image results.
+    
+    Keys hash the uploaded bytes together with the inference options and the models in use
+    (backend, precision, cascade, weight hashes). Entries are the serialized response parts:
+    detections, voice description and, for annotated requests, the base64 JPEG - a boxes-only
+    request is also served from an annotated entry. The memory tier is an LRU bounded by
+    bytes; the optional disk tier (one JSON file per key) is trimmed oldest-first.
+    """
+    
+    def __init__(self, max_bytes: int, disk_dir: str, disk_max_bytes: int):
+        self.max_bytes = max(0, max_bytes)
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = max(0, disk_max_bytes)
+        self.entries = OrderedDict()  # key -> serialized entry (bytes)
+        self.bytes = 0
+        self.disk_bytes = None  # measured on the first disk write
+        self.namespace = None
+        self.lock = threading.Lock()
+        self.counts = Counter()
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 or bool(self.disk_dir)
+    
+    def model_namespace(self) -> str:
+        """Everything besides the request that changes results: cached entries never outlive a model change"""
+        if self.namespace is None:
+            parts = [MODEL_BACKEND, MODEL_PRECISION, f"cascade={int(LIGHT_CASCADE)}"]
+            try:
+                model_path = find_model_dir()
+                parts += [file_digest(os.path.join(model_path, weights)) for _, weights in ModelManager.YOLO_MODELS.values()]
+            except OSError:
+                pass
+            self.namespace = "|".join(parts)
+        return self.namespace
+    
+    def key(self, contents: bytes, confidence: float, imgsz: int) -> str:
+        options = f"{self.model_namespace()}|conf={confidence}|imgsz={imgsz}|"
+        return hashlib.sha256(options.encode() + contents).hexdigest()
+    
+    def disk_path(self, key: str) -> str:
+        return os.path.join(self.disk_dir, key[:2], f"{key}.json")
+    
+    def get(self, key: str, annotate: bool) -> Optional[Dict]:
+        """Cached entry for key, or None on a miss (annotated requests need an entry with the JPEG)"""
+        with self.lock:
+            payload = self.entries.get(key)
+            if payload is not None:
+                self.entries.move_to_end(key)
+        tier = "memory"
+        
+        if payload is None and self.disk_dir:
+            tier = "disk"
+            try:
+                with open(self.disk_path(key), 'rb') as f:
+                    payload = f.read()
+                os.utime(self.disk_path(key))  # recently used files are trimmed last
+            except OSError:
+                payload = None
+        
+        entry = json.loads(payload) if payload is not None else None
+        if entry is None or (annotate and entry.get("annotated_base64") is None):
+            with self.lock:
+                self.counts["misses"] += 1
+            return None
+        
+        if tier == "disk":
+            self._remember(key, payload)
+        with self.lock:
+            self.counts[f"{tier}_hits"] += 1
+        return entry
+    
+    def put(self, key: str, entry: Dict):
+        payload = json.dumps(entry).encode()
+        self._remember(key, payload)
+        if self.disk_dir:
+            self._write_disk(key, payload)
+        with self.lock:
+            self.counts["stores"] += 1
+    
+    def _remember(self, key: str, payload: bytes):
+        if len(payload) > self.max_bytes:
+            return
+        with self.lock:
+            previous = self.entries.pop(key, None)
+            if previous is not None:
+                self.bytes -= len(previous)
+            self.entries[key] = payload
+            self.bytes += len(payload)
+            while self.bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.bytes -= len(evicted)
+                self.counts["evictions"] += 1
+    
+    def _disk_files(self):
+        for root, _, names in os.walk(self.disk_dir):
+            for name in names:
+                if name.endswith(".json"):
+                    yield os.path.join(root, name)
+    
+    def _write_disk(self, key: str, payload: bytes):
+        path = self.disk_path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with self.lock:
+                if self.disk_bytes is None:
+                    self.disk_bytes = sum(os.path.getsize(p) for p in self._disk_files())
+                replaced = os.path.getsize(path) if os.path.exists(path) else 0
+            
+            # Write then rename, so readers never see a partial file
+            temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(temp_path, path)
+            
+            with self.lock:
+                self.disk_bytes += len(payload) - replaced
+                over_budget = self.disk_bytes > self.disk_max_bytes
+            if over_budget:
+                self._trim_disk()
+        except OSError as e:
+            print(f"⚠️ Image cache disk write failed: {e}")
+    
+    def _trim_disk(self):
+        """Delete least recently used files until the disk tier is back under budget"""
+        files = []
+        for path in self._disk_files():
+            try:
+                files.append((os.path.getmtime(path), os.path.getsize(path), path))
+            except OSError:
+                pass
+        
+        with self.lock:
+            self.disk_bytes = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if self.disk_bytes <= self.disk_max_bytes:
+                    break
+                try:
+                    os.unlink(path)
+                except OSError:
+                    continue
+                self.disk_bytes -= size
+                self.counts["disk_evictions"] += 1
+    
+    def stats(self) -> Dict:
+        with self.lock:
+            hits = self.counts["memory_hits"] + self.counts["disk_hits"]
+            lookups = hits + self.counts["misses"]
+            return {
+                "enabled": self.enabled,
+                "entries": len(self.entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "disk_dir": self.disk_dir or None,
+                "disk_bytes": self.disk_bytes,
+                "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+                **self.counts
+            }
+
+image_cache = ImageResultCache(IMAGE_CACHE_MAX_BYTES, IMAGE_CACHE_DIR, IMAGE_CACHE_DISK_MAX_BYTES)
+
+def build_image_response(filename: str, entry: Dict, annotate: bool, cached: bool = False) -> Dict:
+    """Response body for an image from its detections, description and (optional) annotated JPEG"""
+    groups = entry["detections"]
+    response = {
+        "success": True,
+        "type": "image",
+        "filename": filename,
+        "detections": groups,
+        "counts": {
+            "total_objects": len(groups["objects"]),
+            "traffic_lights": len(groups["traffic_lights"]),
+            "zebra_crossings": len(groups["zebra_crossings"])
+        },
+        "voice_description": entry["voice_description"],
+        # True when served from the image result cache
+        "cached": cached
+    }
+    if annotate:
+        response["annotated_image"] = f"data:image/jpeg;base64,{entry['annotated_base64']}"
+    return response
+
 @app.post("/api/detect/image")
 async def detect_objects_in_image(
     file: UploadFile = File(...),
-    confidence: float = 0.4
+    confidence: float = 0.4,
+    annotate: bool = True,  # False = boxes only, no server-side drawing or JPEG encoding
+    imgsz: Optional[int] = None  # Inference size (default IMAGE_IMGSZ); smaller = faster, larger = small objects
 ):
-    """Detect objects in uploaded image using all 3 models"""
+    """Detect objects in uploaded image using all 3 models.
+    
+    Identical uploads with the same options are answered from the image result cache
+    (even while the models are still loading).
+    """
     try:
-        if not model_manager.models_loaded:
-            return JSONResponse(
-                status_code=503,
-                content={"error": "Models not loaded. Please check server logs."}
-            )
-        
-        # Read and decode image
         contents = await file.read()
-        nparr = np.frombuffer(contents, np.uint8)
-        image = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+        imgsz = resolve_imgsz(imgsz, IMAGE_IMGSZ)
         
-        if image is None:
-            return JSONResponse(
-                status_code=400,
-                content={"error": "Invalid image file"}
-            )
+        cache_key = None
+        if image_cache.enabled:
+            cache_key = await asyncio.to_thread(image_cache.key, contents, confidence, imgsz)
+            cached = await asyncio.to_thread(image_cache.get, cache_key, annotate)
+            if cached is not None:
+                print(f"\n📸 Image cache hit: {file.filename}")
+                return build_image_response(file.filename, cached, annotate, cached=True)
+        
+        if not model_manager.models_loaded:
+            return models_not_ready_response()
         
         print(f"\n📸 Processing image: {file.filename}")
         
-        # Run all 3 models
-        detections = model_manager.detect_all(image, confidence)
+        # Decode, run all 3 models and encode on the inference pool
+        detections = await inference_pool.run(run_image_detection, contents, confidence, annotate, imgsz)
         
-        # Convert annotated image to base64
-        _, buffer = cv2.imencode('.jpg', detections["annotated_image"])
-        img_base64 = base64.b64encode(buffer).decode('utf-8')
+        if detections is None:
+            return JSONResponse(
+                status_code=400,
+                content={"error": "Invalid image file"}
+            )
         
         # Generate voice description for vision assistance
-        description = generate_voice_description(detections)
+        description, fallback = await describe_scene_async(detections["detections"])
         
-        return {
-            "success": True,
-            "type": "image",
-            "filename": file.filename,
-            "detections": {
-                "objects": detections["objects"],
-                "traffic_lights": detections["traffic_lights"],
-                "zebra_crossings": detections["zebra_crossings"]
-            },
-            "counts": {
-                "total_objects": len(detections["objects"]),
-                "traffic_lights": len(detections["traffic_lights"]),
-                "zebra_crossings": len(detections["zebra_crossings"])
-            },
+        entry = {
+            "detections": detections["detections"].to_dict(),
             "voice_description": description,
-            "annotated_image": f"data:image/jpeg;base64,{img_base64}"
+            "annotated_base64": detections.get("annotated_base64")
         }
+        # A template stand-in for a late Gemini answer is not stored; the next upload asks again
+        if cache_key and not fallback:
+            await asyncio.to_thread(image_cache.put, cache_key, entry)
         
+        return build_image_response(file.filename, entry, annotate)
+        
+    except InferenceQueueFull:
+        return busy_response()
     except Exception as e:
         print(f"❌ Error: {e}")
         return JSONResponse(
@@ -332,222 +2248,635 @@ async def detect_objects_in_image(
             content={"error": str(e)}
         )
 
+async def save_upload(file: UploadFile, path: str) -> int:
+    """Spool an upload to disk in chunks so the whole file never sits in memory"""
+    size = 0
+    with open(path, 'wb') as f:
+        while True:
+            chunk = await file.read(FILE_CHUNK_SIZE)
+            if not chunk:
+                break
+            f.write(chunk)
+            size += len(chunk)
+    return size
+
+def video_result_path(video_id: str) -> str:
+    return os.path.join(VIDEO_RESULTS_DIR, f"{video_id}.mp4")
+
+def cleanup_video_results():
+    """Delete annotated videos older than VIDEO_RESULT_TTL"""
+    cutoff = time.time() - VIDEO_RESULT_TTL
+    for name in os.listdir(VIDEO_RESULTS_DIR):
+        path = os.path.join(VIDEO_RESULTS_DIR, name)
+        try:
+            if os.path.getmtime(path) < cutoff:
+                os.unlink(path)
+        except OSError:
+            pass
+
+def build_video_response(video: Dict, filename: str, description: str) -> Dict:
+    """Response body for a processed video (annotated video URL is added by the caller)"""
+    latest_objects = video["objects"]
+    latest_lights = video["traffic_lights"]
+    latest_zebra = video["zebra_crossings"]
+    
+    return {
+        "success": True,
+        "type": "video",
+        "filename": filename,
+        "detections": {
+            "objects": latest_objects,  # Latest frame's objects with confidence
+            "traffic_lights": latest_lights,  # Latest frame's lights with confidence
+            "zebra_crossings": latest_zebra  # Latest frame's zebra crossings with confidence
+        },
+        "counts": {
+            "total_objects": len(latest_objects),
+            "traffic_lights": len(latest_lights),
+            "zebra_crossings": len(latest_zebra)
+        },
+        "track_counts": video["track_counts"],
+        "video_info": video["video_info"],
+        "voice_description": description
+    }
+
 @app.post("/api/detect/video")
 async def detect_objects_in_video(
+    request: Request,
     file: UploadFile = File(...),
     confidence: float = 0.4,
-    sample_rate: int = 5  # Process every 5th frame for better quality
+    sample_rate: int = 5,  # Process every 5th frame for better quality
+    annotate: bool = True,  # False = detections only, no annotated video is produced
+    imgsz: Optional[int] = None  # Inference size (default VIDEO_IMGSZ)
 ):
-    """Detect objects in uploaded video and return annotated video"""
-    import os
-    import tempfile
-    from collections import Counter
+    """Detect objects in uploaded video.
     
+    The annotated video is not inlined in the response; "annotated_video" is a URL
+    to download or stream it from /api/videos/{video_id}.
+    """
     temp_input = None
-    temp_output = None
+    output_path = None
     
     try:
         if not model_manager.models_loaded:
-            return JSONResponse(
-                status_code=503,
-                content={"error": "Models not loaded"}
-            )
+            return models_not_ready_response()
         
-        # Create temporary files with proper cleanup
-        temp_input = tempfile.NamedTemporaryFile(delete=False, suffix='.mp4')
-        temp_output = tempfile.NamedTemporaryFile(delete=False, suffix='.mp4')
+        os.makedirs(VIDEO_RESULTS_DIR, exist_ok=True)
+        cleanup_video_results()
         
-        # Save uploaded video
-        content = await file.read()
-        temp_input.write(content)
+        # Save uploaded video to disk chunk by chunk
+        temp_input = tempfile.NamedTemporaryFile(delete=False, suffix='.mp4')
         temp_input.close()
+        upload_size = await save_upload(file, temp_input.name)
         
-        print(f"\n🎥 Processing video: {file.filename}")
-        
-        # Open video
-        cap = cv2.VideoCapture(temp_input.name)
-        
-        # Get video properties
-        fps = int(cap.get(cv2.CAP_PROP_FPS)) or 30
-        width = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
-        height = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
-        total_frames = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
-        
-        # Video writer for annotated output
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(temp_output.name, fourcc, fps, (width, height))
-        
-        frame_count = 0
-        processed_count = 0
-        
-        # Store the LAST processed frame's detections for final summary
-        # (We don't want to sum across all frames - that inflates counts!)
-        latest_objects = []
-        latest_lights = []
-        latest_zebra = []
-        
-        # Process video with memory efficiency
-        while cap.isOpened():
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            # Process every Nth frame for detection, but write all frames
-            if frame_count % sample_rate == 0:
-                print(f"Processing frame {frame_count}/{total_frames}...")
-                
-                # Run detection
-                detections = model_manager.detect_all(frame, confidence)
-                annotated_frame = detections["annotated_image"]
-                
-                # Update to LATEST frame's detections (replaces previous, not extends)
-                latest_objects = detections["objects"]
-                latest_lights = detections["traffic_lights"]
-                latest_zebra = detections["zebra_crossings"]
-                
-                processed_count += 1
-                
-                # Write annotated frame
-                out.write(annotated_frame)
-                
-                # Cache the last annotated frame for skipped frames
-                last_annotated = annotated_frame
-            else:
-                # For skipped frames, write the last annotated frame to maintain smooth video
-                if 'last_annotated' in locals():
-                    out.write(last_annotated)
-                else:
-                    out.write(frame)
-            
-            frame_count += 1
-            
-            # Memory management: Force garbage collection every 100 frames
-            if frame_count % 100 == 0:
-                import gc
-                gc.collect()
-        
-        # Release resources
-        cap.release()
-        out.release()
-        
-        # Count unique object labels for summary (from LATEST frame only)
-        object_labels = [d.get('label', 'unknown') for d in latest_objects]
-        light_colors = [d.get('color', d.get('label', 'unknown')) for d in latest_lights]
-        object_counts = Counter(object_labels)
-        light_counts = Counter(light_colors)
+        video_id = uuid.uuid4().hex if annotate else None
+        output_path = video_result_path(video_id) if annotate else None
         
-        print(f"✅ Video processing complete: {frame_count} frames, {processed_count} processed")
-        print(f"📊 Latest frame detections: {len(latest_objects)} objects, {len(latest_lights)} lights, {len(latest_zebra)} zebra crossings")
+        print(f"\n🎥 Processing video: {file.filename} ({upload_size / 1024 / 1024:.1f} MB)")
         
-        # Read annotated video and convert to base64
-        with open(temp_output.name, 'rb') as f:
-            video_bytes = f.read()
-            video_base64 = base64.b64encode(video_bytes).decode('utf-8')
+        # Decode, detect and re-encode the whole video on the video pool; the inference
+        # pool stays free for the short image and live jobs
+        video = await video_pool.run(
+            process_video_file, temp_input.name, output_path, confidence, sample_rate,
+            None, resolve_imgsz(imgsz, VIDEO_IMGSZ)
+        )
         
         # Generate voice description using LATEST frame's detections
-        summary_detections = {
-            "objects": latest_objects,
-            "traffic_lights": latest_lights,
-            "zebra_crossings": latest_zebra
-        }
-        description = generate_voice_description(summary_detections, width, height)
+        description = await generate_voice_description_async(video["detections"], video["width"], video["height"])
         
-        # Calculate video duration
-        duration = frame_count / fps if fps > 0 else 0
+        response = build_video_response(video, file.filename, description)
+        if annotate:
+            response["video_id"] = video_id
+            response["annotated_video"] = str(request.url_for("get_annotated_video", video_id=video_id))
         
-        return {
-            "success": True,
-            "type": "video",
-            "filename": file.filename,
-            "detections": {
-                "objects": latest_objects,  # Latest frame's objects with confidence
-                "traffic_lights": latest_lights,  # Latest frame's lights with confidence
-                "zebra_crossings": latest_zebra  # Latest frame's zebra crossings with confidence
-            },
-            "counts": {
-                "total_objects": len(latest_objects),
-                "traffic_lights": len(latest_lights),
-                "zebra_crossings": len(latest_zebra)
-            },
-            "video_info": {
-                "total_frames": frame_count,
-                "processed_frames": processed_count,
-                "fps": fps,
-                "duration": duration
-            },
-            "voice_description": description,
-            "annotated_video": f"data:video/mp4;base64,{video_base64}"
-        }
+        return response
         
+    except InferenceQueueFull:
+        if output_path and os.path.exists(output_path):
+            os.unlink(output_path)
+        return busy_response()
     except Exception as e:
         print(f"❌ Error: {e}")
         import traceback
         traceback.print_exc()
+        if output_path and os.path.exists(output_path):
+            os.unlink(output_path)
         return JSONResponse(
             status_code=500,
             content={"error": str(e)}
         )
     
     finally:
-        # Cleanup temporary files
+        # Cleanup temporary upload
         try:
             if temp_input and os.path.exists(temp_input.name):
                 os.unlink(temp_input.name)
-            if temp_output and os.path.exists(temp_output.name):
-                os.unlink(temp_output.name)
         except Exception as cleanup_error:
             print(f"⚠️ Cleanup warning: {cleanup_error}")
 
+def parse_range_header(range_header: str, file_size: int) -> Optional[tuple]:
+    """Parse a single "bytes=start-end" range; returns (start, end) inclusive or None if unsatisfiable"""
+    try:
+        unit, _, spec = range_header.partition("=")
+        if unit.strip() != "bytes" or "," in spec:
+            return None
+        start_text, _, end_text = spec.strip().partition("-")
+        if start_text:
+            start = int(start_text)
+            end = int(end_text) if end_text else file_size - 1
+        else:
+            # Suffix range: last N bytes
+            start = max(0, file_size - int(end_text))
+            end = file_size - 1
+    except ValueError:
+        return None
+    
+    end = min(end, file_size - 1)
+    if start > end:
+        return None
+    return start, end
+
+def iter_file(path: str, start: int, end: int):
+    """Yield bytes start..end (inclusive) of a file in chunks"""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = f.read(min(FILE_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+
+@app.get("/api/videos/{video_id}")
+async def get_annotated_video(video_id: str, request: Request):
+    """Stream an annotated video, with HTTP Range support for seeking"""
+    if not video_id.isalnum() or not os.path.exists(video_result_path(video_id)):
+        return JSONResponse(status_code=404, content={"error": "Video not found or expired"})
+    
+    return stream_video_file(video_result_path(video_id), request)
+
+def stream_video_file(path: str, request: Request):
+    """StreamingResponse for an mp4 file, honouring a single HTTP Range"""
+    file_size = os.path.getsize(path)
+    headers = {"Accept-Ranges": "bytes"}
+    
+    range_header = request.headers.get("range")
+    if range_header:
+        byte_range = parse_range_header(range_header, file_size)
+        if byte_range is None:
+            return JSONResponse(
+                status_code=416,
+                content={"error": "Requested range not satisfiable"},
+                headers={"Content-Range": f"bytes */{file_size}"}
+            )
+        start, end = byte_range
+        headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(iter_file(path, start, end), status_code=206, media_type="video/mp4", headers=headers)
+    
+    headers["Content-Length"] = str(file_size)
+    return StreamingResponse(iter_file(path, 0, file_size - 1), media_type="video/mp4", headers=headers)
+
+# --- Video Jobs ---
+
+class VideoJobManager:
+    """Runs video uploads as background jobs with progress and results persisted on disk.
+    
+    Each job lives in VIDEO_JOBS_DIR/<job_id>/ (input.mp4, annotated.mp4, status.json,
+    result.json), so finished results survive client disconnects and server restarts.
+    """
+    
+    def __init__(self, jobs_dir: str, workers: int, queue_size: int):
+        self.jobs_dir = jobs_dir
+        self.workers = max(1, workers)
+        self.queue_size = max(0, queue_size)
+        self.executor = None
+        self.jobs = {}
+        self.lock = threading.Lock()
+    
+    def start(self):
+        os.makedirs(self.jobs_dir, exist_ok=True)
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="video-job")
+        
+        # Reload persisted jobs; anything unfinished was interrupted by the restart
+        for job_id in os.listdir(self.jobs_dir):
+            if not os.path.isdir(self.path(job_id)):
+                continue
+            try:
+                with open(self.path(job_id, "status.json")) as f:
+                    status = json.load(f)
+            except (OSError, ValueError):
+                # No status yet: an upload cut off by the restart (a partial input.mp4)
+                shutil.rmtree(self.path(job_id), ignore_errors=True)
+                continue
+            if status["state"] in ("queued", "running"):
+                # finished_at starts the VIDEO_JOB_TTL clock, so the failure stays visible to pollers
+                status.update(state="failed", error="Interrupted by server restart", finished_at=time.time())
+                self._write_json(job_id, "status.json", status)
+            self.jobs[job_id] = status
+        
+        print(f"⚡ Video job pool started ({self.workers} workers, {len(self.jobs)} stored jobs)")
+    
+    def shutdown(self):
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+    
+    def path(self, job_id: str, name: str = "") -> str:
+        return os.path.join(self.jobs_dir, job_id, name)
+    
+    def _write_json(self, job_id: str, name: str, data: Dict):
+        # Write-then-rename so readers never see a half-written file
+        temp_path = self.path(job_id, name + ".tmp")
+        with open(temp_path, 'w') as f:
+            json.dump(data, f)
+        os.replace(temp_path, self.path(job_id, name))
+    
+    def _update(self, job_id: str, persist: bool = True, **fields):
+        with self.lock:
+            status = self.jobs[job_id]
+            status.update(fields)
+            snapshot = dict(status)
+        if persist:
+            self._write_json(job_id, "status.json", snapshot)
+    
+    def get(self, job_id: str) -> Optional[Dict]:
+        with self.lock:
+            status = self.jobs.get(job_id)
+            return dict(status) if status else None
+    
+    def stats(self) -> Dict:
+        with self.lock:
+            states = Counter(status["state"] for status in self.jobs.values())
+        return {"workers": self.workers, **states}
+    
+    def new_job(self) -> str:
+        """Reserve a job id and directory, or raise InferenceQueueFull.
+        
+        The reservation ("uploading") counts against the queue while the upload is
+        spooled, so concurrent uploads can't all pass the check.
+        """
+        self.cleanup()
+        job_id = uuid.uuid4().hex
+        with self.lock:
+            waiting = sum(1 for status in self.jobs.values() if status["state"] in ("uploading", "queued", "running"))
+            if waiting >= self.workers + self.queue_size:
+                raise InferenceQueueFull("Video job queue is full")
+            self.jobs[job_id] = {"job_id": job_id, "state": "uploading", "created_at": time.time()}
+        os.makedirs(self.path(job_id))
+        return job_id
+    
+    def discard(self, job_id: str):
+        """Drop a reservation whose upload failed"""
+        with self.lock:
+            self.jobs.pop(job_id, None)
+        shutil.rmtree(self.path(job_id), ignore_errors=True)
+    
+    def submit(self, job_id: str, filename: str, confidence: float, sample_rate: int, annotate: bool, imgsz: int):
+        with self.lock:
+            self.jobs[job_id] = {
+                "job_id": job_id,
+                "state": "queued",
+                "filename": filename,
+                "options": {"confidence": confidence, "sample_rate": sample_rate, "annotate": annotate, "imgsz": imgsz},
+                "created_at": time.time()
+            }
+        self._update(job_id)
+        self.executor.submit(self._run, job_id)
+    
+    def _run(self, job_id: str):
+        status = self.get(job_id)
+        options = status["options"]
+        started = time.time()
+        self._update(job_id, state="running", started_at=started)
+        last_persist = [0.0]
+        
+        def report_progress(frames_done: int, total_frames: int, processed_frames: int):
+            elapsed = max(time.time() - started, 1e-6)
+            fps = frames_done / elapsed
+            remaining = max(total_frames - frames_done, 0)
+            # Progress is persisted at most once a second, kept in memory otherwise
+            persist = time.time() - last_persist[0] >= 1.0
+            if persist:
+                last_persist[0] = time.time()
+            self._update(
+                job_id,
+                persist=persist,
+                frames_done=frames_done,
+                total_frames=total_frames,
+                processed_frames=processed_frames,
+                fps=round(fps, 2),
+                eta_seconds=round(remaining / fps, 1) if fps > 0 else None
+            )
+        
+        output_path = self.path(job_id, "annotated.mp4") if options["annotate"] else None
+        try:
+            print(f"\n🎥 Video job {job_id}: {status['filename']}")
+            video = process_video_file(
+                self.path(job_id, "input.mp4"), output_path,
+                options["confidence"], options["sample_rate"], report_progress, options.get("imgsz")
+            )
+            description = generate_voice_description(video["detections"], video["width"], video["height"])
+            self._write_json(job_id, "result.json", build_video_response(video, status["filename"], description))
+            self._update(job_id, state="completed", finished_at=time.time(), eta_seconds=0)
+        except Exception as e:
+            print(f"❌ Video job {job_id} failed: {e}")
+            self._update(job_id, state="failed", error=str(e), finished_at=time.time())
+        finally:
+            # The upload is not needed once the job has finished
+            try:
+                os.unlink(self.path(job_id, "input.mp4"))
+            except OSError:
+                pass
+    
+    def cleanup(self):
+        """Remove finished jobs older than VIDEO_JOB_TTL"""
+        cutoff = time.time() - VIDEO_JOB_TTL
+        with self.lock:
+            expired = [
+                job_id for job_id, status in self.jobs.items()
+                if status["state"] in ("completed", "failed") and status.get("finished_at", 0) < cutoff
+            ]
+            for job_id in expired:
+                del self.jobs[job_id]
+        for job_id in expired:
+            shutil.rmtree(self.path(job_id), ignore_errors=True)
+
+video_jobs = VideoJobManager(VIDEO_JOBS_DIR, VIDEO_JOB_WORKERS, VIDEO_JOB_QUEUE_SIZE)
+
+@app.post("/api/jobs/video", status_code=202)
+async def submit_video_job(
+    request: Request,
+    file: UploadFile = File(...),
+    confidence: float = 0.4,
+    sample_rate: int = 5,
+    annotate: bool = True,
+    imgsz: Optional[int] = None
+):
+    """Queue a video for background processing; poll the returned status URL for progress"""
+    if not model_manager.models_loaded:
+        return models_not_ready_response()
+    
+    try:
+        job_id = video_jobs.new_job()
+    except InferenceQueueFull:
+        return busy_response()
+    
+    try:
+        upload_size = await save_upload(file, video_jobs.path(job_id, "input.mp4"))
+    except asyncio.CancelledError:
+        # Client went away mid-upload
+        video_jobs.discard(job_id)
+        raise
+    except Exception as e:
+        video_jobs.discard(job_id)
+        return JSONResponse(status_code=500, content={"error": str(e)})
+    
+    video_jobs.submit(job_id, file.filename, confidence, sample_rate, annotate, resolve_imgsz(imgsz, VIDEO_IMGSZ))
+    print(f"📥 Video job {job_id} queued: {file.filename} ({upload_size / 1024 / 1024:.1f} MB)")
+    
+    return {
+        "job_id": job_id,
+        "state": "queued",
+        "status_url": str(request.url_for("get_video_job", job_id=job_id)),
+        "result_url": str(request.url_for("get_video_job_result", job_id=job_id))
+    }
+
+@app.get("/api/jobs/{job_id}")
+async def get_video_job(job_id: str):
+    """Job state with frames processed, processing FPS and ETA"""
+    status = video_jobs.get(job_id)
+    if status is None:
+        return JSONResponse(status_code=404, content={"error": "Job not found or expired"})
+    return status
+
+@app.get("/api/jobs/{job_id}/result")
+async def get_video_job_result(job_id: str, request: Request):
+    """Result of a completed job (same shape as /api/detect/video)"""
+    status = video_jobs.get(job_id)
+    if status is None:
+        return JSONResponse(status_code=404, content={"error": "Job not found or expired"})
+    if status["state"] != "completed":
+        return JSONResponse(status_code=409, content={"error": f"Job is {status['state']}", "state": status["state"]})
+    
+    with open(video_jobs.path(job_id, "result.json")) as f:
+        result = json.load(f)
+    if status["options"]["annotate"]:
+        result["annotated_video"] = str(request.url_for("get_video_job_video", job_id=job_id))
+    return result
+
+@app.get("/api/jobs/{job_id}/video")
+async def get_video_job_video(job_id: str, request: Request):
+    """Stream the annotated video of a completed job (HTTP Range supported)"""
+    status = video_jobs.get(job_id)
+    path = video_jobs.path(job_id, "annotated.mp4") if status else None
+    if status is None or status["state"] != "completed" or not os.path.exists(path):
+        return JSONResponse(status_code=404, content={"error": "Video not available"})
+    return stream_video_file(path, request)
+
+class LiveSession:
+    """Per-connection frame slot: only the newest unprocessed frame is kept"""
+    
+    def __init__(self):
+        self.latest = None
+        self.ready = asyncio.Event()
+        self.received = 0
+        self.dropped = 0
+        self.scene_gate = SceneChangeGate("live")
+        # Last response and the options it was produced with, reused while the scene is unchanged
+        self.last_response = None
+        self.last_options = None
+    
+    def put(self, frame: Dict):
+        # Latest frame wins: a frame still waiting here is stale, replace it
+        if self.latest is not None:
+            self.dropped += 1
+        frame["received_at"] = time.perf_counter()
+        self.latest = frame
+        self.received += 1
+        self.ready.set()
+    
+    async def take(self) -> Dict:
+        await self.ready.wait()
+        self.ready.clear()
+        frame, self.latest = self.latest, None
+        return frame
+
+def validate_live_options(options) -> Dict:
+    """Per-frame options with checked types; raises ValueError so a bad frame is skipped, not the session"""
+    if not isinstance(options, dict):
+        raise ValueError("frame options must be a JSON object")
+    checked = {}
+    try:
+        if options.get("confidence") is not None:
+            checked["confidence"] = float(options["confidence"])
+            if not 0.0 <= checked["confidence"] <= 1.0:
+                raise ValueError("confidence must be between 0 and 1")
+        if options.get("imgsz") is not None:
+            checked["imgsz"] = int(options["imgsz"])
+    except (TypeError, OverflowError) as e:
+        raise ValueError(f"invalid frame option: {e}")
+    if options.get("annotate") is not None:
+        if not isinstance(options["annotate"], bool):
+            raise ValueError("annotate must be true or false")
+        checked["annotate"] = options["annotate"]
+    return checked
+
+def parse_live_message(message: Dict) -> Optional[Dict]:
+    """Turn a WebSocket message into a frame dict (binary header + JPEG, or base64 text)"""
+    if message.get("bytes") is not None:
+        data = message["bytes"]
+        if len(data) < LIVE_FRAME_HEADER.size:
+            return None
+        
+        frame_id, timestamp, options_length = LIVE_FRAME_HEADER.unpack_from(data)
+        options_end = LIVE_FRAME_HEADER.size + options_length
+        options = json.loads(data[LIVE_FRAME_HEADER.size:options_end]) if options_length else {}
+        options = validate_live_options(options)
+        
+        return {
+            "image": data[options_end:],
+            "frame_id": frame_id,
+            "timestamp": timestamp,
+            "options": options
+        }
+    
+    if message.get("text") is not None:
+        data = message["text"]
+        # Decode base64 image (data URL or plain base64)
+        if ',' in data:
+            img_data = base64.b64decode(data.split(',')[1])
+        else:
+            img_data = base64.b64decode(data)
+        return {"image": img_data, "options": {}}
+    
+    return None
+
+async def process_live_frames(websocket: WebSocket, session: LiveSession, annotate: bool, imgsz: int = LIVE_IMGSZ):
+    """Run detection on the newest frame of a session whenever the previous one is done"""
+    while True:
+        frame = await session.take()
+        
+        if not model_manager.models_loaded:
+            continue
+        
+        options = frame["options"]
+        confidence = float(options.get("confidence", 0.4))
+        frame_annotate = bool(options.get("annotate", annotate))
+        frame_imgsz = resolve_imgsz(options.get("imgsz"), imgsz)
+        
+        # Decode here (downscaled if oversized) so the scene-change gate can look at the frame before inference
+        image, scale = await asyncio.to_thread(decode_image_scaled, frame["image"], frame_imgsz)
+        if image is None:
+            continue
+        
+        same_options = session.last_options == (confidence, frame_annotate, frame_imgsz)
+        infer = await asyncio.to_thread(
+            session.scene_gate.should_infer, image, session.last_response is None or not same_options
+        )
+        
+        if not infer:
+            # Scene unchanged: resend the previous result without running the models
+            response = dict(session.last_response)
+            response["scene_unchanged"] = True
+            response["scene_skipped_frames"] = session.scene_gate.skipped
+            response["dropped_frames"] = session.dropped
+            if "frame_id" in frame:
+                response["frame_id"] = frame["frame_id"]
+                response["timestamp"] = frame["timestamp"]
+            await websocket.send_json(response)
+            metrics.observe("myvision_live_frame_seconds", time.perf_counter() - frame["received_at"], result="scene_unchanged")
+            continue
+        
+        try:
+            # Batched with frames from other live sessions, run on the inference pool
+            detections = await live_scheduler.submit(image, confidence, frame_annotate, frame_imgsz, scale)
+        except InferenceQueueFull:
+            await websocket.send_json({"error": "Server is busy, frame skipped"})
+            continue
+        
+        if detections is None:
+            continue
+        
+        # Get frame dimensions for better descriptions
+        frame_width, frame_height = detections["frame_size"]
+        
+        groups = detections["detections"].to_dict()
+        session.scene_gate.record(detections["detections"], image, scale)
+        
+        # Generate voice description with Gemini AI
+        description = await generate_voice_description_async(detections["detections"], frame_width, frame_height, fast=True)
+        
+        response = {
+            "detections": groups,
+            "voice_description": description,
+            "dropped_frames": session.dropped,
+            "scene_unchanged": False,
+            "scene_skipped_frames": session.scene_gate.skipped
+        }
+        if frame_annotate:
+            response["annotated_frame"] = f"data:image/jpeg;base64,{detections['annotated_base64']}"
+        session.last_response = dict(response)
+        session.last_options = (confidence, frame_annotate, frame_imgsz)
+        if "frame_id" in frame:
+            response["frame_id"] = frame["frame_id"]
+            response["timestamp"] = frame["timestamp"]
+        
+        # Send back results
+        await websocket.send_json(response)
+        metrics.observe("myvision_live_frame_seconds", time.perf_counter() - frame["received_at"], result="detected")
+
 @app.websocket("/api/detect/live")
 async def websocket_live_detection(websocket: WebSocket):
-    """WebSocket endpoint for real-time camera detection"""
+    """WebSocket endpoint for real-time camera detection.
+    
+    Accepts base64 data-URL text frames or binary frames (LIVE_FRAME_HEADER + JPEG).
+    Frames arriving while the previous one is still being processed replace each other,
+    so only the newest frame is processed and latency stays bounded.
+    Connect with ?annotate=false to receive detections only (no annotated frames), and
+    ?imgsz= to pick the inference size (binary frame options can override both per frame).
+    """
     await websocket.accept()
-    print("🔌 WebSocket client connected")
+    annotate = websocket.query_params.get("annotate", "true").lower() not in ("false", "0", "no")
+    try:
+        imgsz = resolve_imgsz(websocket.query_params.get("imgsz"), LIVE_IMGSZ)
+    except ValueError:
+        imgsz = LIVE_IMGSZ
+    print(f"🔌 WebSocket client connected{'' if annotate else ' (boxes only)'}")
+    
+    session = LiveSession()
+    processor = asyncio.create_task(process_live_frames(websocket, session, annotate, imgsz))
+    metrics.add_gauge("myvision_websocket_sessions", 1)
     
     try:
         while True:
-            # Receive frame from client (base64 encoded)
-            data = await websocket.receive_text()
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                raise WebSocketDisconnect(message.get("code", 1000))
             
-            # Decode base64 image
-            if ',' in data:
-                img_data = base64.b64decode(data.split(',')[1])
-            else:
-                img_data = base64.b64decode(data)
+            if processor.done():
+                # Surface errors from the processing task
+                processor.result()
+                break
             
-            nparr = np.frombuffer(img_data, np.uint8)
-            frame = cv2.imdecode(nparr, cv2.IMREAD_COLOR)
+            try:
+                frame = parse_live_message(message)
+            except (ValueError, struct.error) as e:
+                print(f"⚠️ Malformed live frame: {e}")
+                continue
             
-            if frame is not None and model_manager.models_loaded:
-                # Run all 3 models
-                detections = model_manager.detect_all(frame, conf_threshold=0.4)
-                
-                # Get frame dimensions for better descriptions
-                frame_height, frame_width = frame.shape[:2]
-                
-                # Encode annotated frame
-                _, buffer = cv2.imencode('.jpg', detections["annotated_image"])
-                img_base64 = base64.b64encode(buffer).decode('utf-8')
-                
-                # Generate voice description with Gemini AI
-                description = generate_voice_description(detections, frame_width, frame_height)
-                
-                # Send back results
-                await websocket.send_json({
-                    "annotated_frame": f"data:image/jpeg;base64,{img_base64}",
-                    "detections": {
-                        "objects": detections["objects"],
-                        "traffic_lights": detections["traffic_lights"],
-                        "zebra_crossings": detections["zebra_crossings"]
-                    },
-                    "voice_description": description
-                })
+            if frame is not None:
+                session.put(frame)
                 
     except WebSocketDisconnect:
         print("🔌 WebSocket client disconnected")
     except Exception as e:
         print(f"❌ WebSocket error: {e}")
         await websocket.close()
+    finally:
+        processor.cancel()
+        metrics.add_gauge("myvision_websocket_sessions", -1)
+        print(f"📊 Live session: {session.received} frames received, {session.dropped} stale frames dropped")
 
 # --- Helper Functions for Advanced Vision Assistance ---
 
@@ -569,23 +2898,14 @@ INFRASTRUCTURE = {
     'street sign', 'bench'
 }
 
-def get_proximity(box: List[float]) -> float:
-    """Calculate proximity based on bounding box height (proxy for distance)"""
-    return box[3] - box[1]  # y2 - y1
+# Direction zones across the frame width: a box centre below ZONE_EDGES[i] * frame_width is in ZONES[i]
+ZONES = ("far left", "left", "center", "right", "far right")
+ZONE_EDGES = np.array([0.2, 0.4, 0.6, 0.8])
 
 def get_direction(box: List[float], frame_width: int) -> str:
-    """Estimate direction relative to frame using 5 zones"""
+    """Estimate direction relative to frame using the 5 ZONES (SceneAnalysis does the same for all boxes at once)"""
     x_center = (box[0] + box[2]) / 2
-    if x_center < frame_width * 0.2:
-        return "far left"
-    elif x_center < frame_width * 0.4:
-        return "left"
-    elif x_center < frame_width * 0.6:
-        return "center"
-    elif x_center < frame_width * 0.8:
-        return "right"
-    else:
-        return "far right"
+    return ZONES[int(np.searchsorted(ZONE_EDGES * frame_width, x_center, side="right"))]
 
 def is_moving_object(label: str) -> bool:
     """Check if an object can move"""
@@ -595,39 +2915,113 @@ def is_static_object(label: str) -> bool:
     """Check if an object is typically static"""
     return label.lower() in STATIC_OBJECTS
 
-def get_closest_object(detections: List[Dict]) -> Optional[Dict]:
-    """Find the closest object based on proximity"""
-    if not detections:
-        return None
-    return max(detections, key=lambda d: get_proximity(d.get("bbox", [0, 0, 0, 0])))
-
-def check_safety(detections: Dict, frame_height: int) -> bool:
-    """Determine if it's safe to cross based on traffic conditions"""
-    # Check for green light
-    has_green = any(
-        d.get("label", "").lower() in ["green", "green light"] 
-        for d in detections.get("traffic_lights", [])
-    )
+VEHICLES = {'car', 'truck', 'bus', 'motorcycle'}
+
+# Object categories as lookup-table codes, and their weight in the hazard score
+STATIC, MOVING, VEHICLE = range(3)
+HAZARD_WEIGHTS = np.array([0.0, 0.6, 1.0])
+
+# Lookup tables per label mapping: id(names) -> (names, lowercased labels, category codes)
+_category_tables = {}
+
+def category_tables(names: Dict[int, str]) -> tuple:
+    """Lowercased labels and category codes indexed by class id, built once per model's names.
     
-    # Check for nearby cars
-    has_car_close = any(
-        d.get("label", "").lower() == "car" and 
-        get_proximity(d.get("bbox", [0, 0, 0, 0])) > 0.2 * frame_height
-        for d in detections.get("objects", [])
-    )
+    The extra last slot is for class ids the mapping doesn't know (static, labelled by id).
+    """
+    entry = _category_tables.get(id(names))
+    if entry is None or entry[0] is not names:
+        size = max(names, default=-1) + 2
+        labels = [str(cls) for cls in range(size)]
+        categories = np.full(size, STATIC, dtype=np.intp)
+        for cls, label in names.items():
+            labels[cls] = label.lower()
+            if labels[cls] in VEHICLES:
+                categories[cls] = VEHICLE
+            elif is_moving_object(label):
+                categories[cls] = MOVING
+        entry = (names, labels, categories)
+        _category_tables[id(names)] = entry
+    return entry[1], entry[2]
+
+class SceneAnalysis:
+    """Per-object attributes of one frame, computed in one vectorized pass over a Detections container.
     
-    # Check for nearby people
-    has_person_close = any(
-        d.get("label", "").lower() == "person" and 
-        get_proximity(d.get("bbox", [0, 0, 0, 0])) > 0.2 * frame_height
-        for d in detections.get("objects", [])
-    )
+    For every object: lowercased label, zone (index into ZONES, needs frame_width), apparent
+    height (proximity proxy), moving/vehicle category from the class-id lookup table and a
+    hazard score in [0, 1] - big (close) vehicles in front of the user score highest, static
+    objects score 0. The template describer, the Gemini prompt and the scene signature all
+    read from this instead of walking the detection dicts.
+    """
     
-    if has_car_close or has_person_close:
-        return False
-    if has_green and not (has_car_close or has_person_close):
-        return True
-    return False
+    def __init__(self, found: Detections, frame_width: Optional[int] = None, frame_height: Optional[int] = None):
+        self.frame_width = frame_width
+        self.frame_height = frame_height
+        
+        is_object = found.source == Detections.OBJECTS
+        xyxy = found.xyxy[is_object]
+        labels, categories = category_tables(found.names[Detections.OBJECTS])
+        classes = np.minimum(found.cls[is_object], len(labels) - 1)
+        category = categories[classes]
+        self.labels = [labels[cls] for cls in classes.tolist()]
+        self.moving = category != STATIC
+        self.vehicle = category == VEHICLE
+        
+        self.height = xyxy[:, 3] - xyxy[:, 1]
+        centre = (xyxy[:, 0] + xyxy[:, 2]) * 0.5
+        self.zone = np.searchsorted(ZONE_EDGES * frame_width, centre, side="right") if frame_width else None
+        
+        # Closeness: height relative to the frame (or to the tallest object when the size is unknown)
+        reference = frame_height or max(float(self.height.max(initial=0)), 1.0)
+        self.closeness = np.minimum(self.height / reference, 1.0)
+        # 1 straight ahead, 0.5 at the frame edges
+        centrality = 1 - np.minimum(np.abs(centre / frame_width - 0.5), 0.5) if frame_width else 1.0
+        self.hazard = self.closeness * centrality * HAZARD_WEIGHTS[category]
+        
+        moving = self.moving.tolist()
+        self.moving_labels = [label for label, is_moving in zip(self.labels, moving) if is_moving]
+        self.static_labels = [label for label, is_moving in zip(self.labels, moving) if not is_moving]
+        
+        is_light = found.source == Detections.TRAFFIC_LIGHTS
+        light_names = found.names[Detections.TRAFFIC_LIGHTS]
+        self.light_colors = [light_names.get(cls, str(cls)).lower() for cls in found.cls[is_light].tolist()]
+        self.zebra_crossings = len(found) - len(self.labels) - len(self.light_colors)
+    
+    def closest_moving(self) -> Optional[int]:
+        """Index of the tallest (closest) moving object"""
+        if not self.moving_labels:
+            return None
+        return int(np.argmax(np.where(self.moving, self.height, -np.inf)))
+    
+    def most_hazardous(self) -> Optional[int]:
+        if not self.moving_labels:
+            return None
+        index = int(np.argmax(self.hazard))
+        return index if self.hazard[index] > 0 else None
+    
+    def urgent_hazard(self) -> Optional[tuple]:
+        """(label, direction, "close"/"far") of the most hazardous object, as given to Gemini"""
+        index = self.most_hazardous()
+        if index is None:
+            return None
+        return self.labels[index], self.direction(index), "close" if self.closeness[index] > 0.2 else "far"
+    
+    def direction(self, index: Optional[int]) -> Optional[str]:
+        if index is None or self.zone is None:
+            return None
+        return ZONES[self.zone[index]]
+    
+    @property
+    def has_vehicles(self) -> bool:
+        return bool(self.vehicle.any())
+    
+    @property
+    def safe_to_cross(self) -> bool:
+        """Green light and no car or person taking up more than 20% of the frame height"""
+        for label, close in zip(self.labels, (self.closeness > 0.2).tolist()):
+            if close and label in ("car", "person"):
+                return False
+        return "green" in self.light_colors or "green light" in self.light_colors
 
 def summarize_objects(detections: List[Dict]) -> str:
     """Summarize detected objects with counts"""
@@ -640,63 +3034,51 @@ def summarize_objects(detections: List[Dict]) -> str:
             summary.append(f"{count} {label.lower()}s")
     return ", ".join(summary)
 
-def generate_polite_text(base_instruction: str, tokenizer, llm_model) -> str:
-    """Use Flan-T5 LLM to make instructions polite and natural"""
-    if not tokenizer or not llm_model:
-        return base_instruction
-    
-    try:
-        prompt = f"Convert this instruction into a polite, natural sentence: {base_instruction}"
-        input_ids = tokenizer(prompt, return_tensors="pt").input_ids
-        
-        # Generate with beam search for better quality
-        with torch.no_grad():
-            outputs = llm_model.generate(
-                input_ids, 
-                max_length=60, 
-                num_beams=4, 
-                early_stopping=True,
-                no_repeat_ngram_size=2
-            )
-        
-        polite_text = tokenizer.decode(outputs[0], skip_special_tokens=True)
-        return polite_text if polite_text else base_instruction
-    except Exception as e:
-        print(f"⚠️ LLM generation error: {e}")
-        return base_instruction
+def generate_polite_text(base_instruction: str, fast: bool = False) -> str:
+    """Use Flan-T5 LLM to make instructions polite and natural (batched and memoized by text_engine)"""
+    return text_engine.polish([base_instruction], fast)[0]
 
-def generate_gemini_description(detections: Dict, gemini_model) -> str:
-    """Use Gemini AI for ultra-natural, context-aware voice descriptions"""
-    if not gemini_model:
-        return None
+def split_sentences(description: str) -> List[str]:
+    """Sentences of a template description (they never contain inner periods)"""
+    return [part for part in description.rstrip(".").split(". ") if part]
+
+def join_sentences(sentences: List[str]) -> str:
+    return " ".join(s if s.endswith((".", "!", "?")) else s + "." for s in sentences)
+
+def polish_description(description: str, fast: bool = False) -> str:
+    """Rephrase a template description sentence by sentence with Flan-T5, when enabled"""
+    if not (LLM_POLISH_DESCRIPTIONS and text_engine.ready and description):
+        return description
+    return join_sentences(text_engine.polish(split_sentences(description), fast))
+
+async def polish_description_async(description: str, fast: bool = False) -> str:
+    if not (LLM_POLISH_DESCRIPTIONS and text_engine.ready and description):
+        return description
+    return join_sentences(await text_engine.polish_async(split_sentences(description), fast))
+
+def build_gemini_prompt(scene: SceneAnalysis) -> str:
+    """Gemini prompt for a scene"""
+    # Count objects
+    moving_counts = Counter(scene.moving_labels)
+    static_counts = Counter(scene.static_labels)
     
-    try:
-        # Build context for Gemini
-        moving_objects = []
-        static_objects = []
-        
-        for obj in detections.get("objects", []):
-            label = obj.get("label", "unknown").lower()
-            if is_moving_object(label):
-                moving_objects.append(obj)
-            else:
-                static_objects.append(obj)
-        
-        # Count objects
-        moving_counts = Counter([d.get("label", "object").lower() for d in moving_objects])
-        static_counts = Counter([d.get("label", "object").lower() for d in static_objects])
-        traffic_lights = detections.get("traffic_lights", [])
-        zebra_crossings = detections.get("zebra_crossings", [])
-        
-        # Build Gemini prompt
-        prompt = f"""You are an AI assistant helping a visually impaired person navigate safely. 
+    hazard = "None"
+    urgent = scene.urgent_hazard()
+    if urgent is not None:
+        label, direction, closeness = urgent
+        hazard = f"{label}{' on your ' + direction if direction else ''} ({closeness})"
+    
+    # Build Gemini prompt
+    return f"""You are an AI assistant helping a visually impaired person navigate safely. 
 Analyze this scene and provide a brief, clear, helpful voice description (max 2-3 sentences).
 
 Scene Details:
 - Moving objects (vehicles/people): {dict(moving_counts) if moving_counts else "None"}
 - Static objects: {dict(static_counts) if static_counts else "None"}
-- Traffic lights: {[d.get('color', d.get('label', '')) for d in traffic_lights] if traffic_lights else "None"}
-- Zebra crossings: {"Yes" if zebra_crossings else "No"}
+- Traffic lights: {scene.light_colors if scene.light_colors else "None"}
+- Zebra crossings: {"Yes" if scene.zebra_crossings else "No"}
+- Most urgent hazard: {hazard}
+- Safe to cross (estimate): {"Yes" if scene.safe_to_cross else "No"}
 
 Guidelines:
 1. Prioritize safety-critical information (traffic lights, vehicles, crossings)
@@ -707,8 +3089,15 @@ Guidelines:
 
 Voice description:"""
 
+def generate_gemini_description(prompt: str, gemini_model) -> Optional[str]:
+    """Use Gemini AI for ultra-natural, context-aware voice descriptions (blocking, runs on the Gemini pool)"""
+    if not gemini_model:
+        return None
+    
+    try:
         # Generate with Gemini
-        response = gemini_model.generate_content(prompt)
+        with metrics.timer("gemini"):
+            response = gemini_model.generate_content(prompt)
         gemini_text = response.text.strip()
         
         return gemini_text if gemini_text else None
@@ -717,34 +3106,285 @@ Voice description:"""
         print(f"⚠️ Gemini generation error: {e}")
         return None
 
-def generate_voice_description(detections: Dict, frame_width: Optional[int] = None, frame_height: Optional[int] = None) -> str:
+# --- Gemini Call Service ---
+
+class TokenBucket:
+    """Token-bucket rate limiter: `rate` tokens per second, up to `capacity` stored"""
+    
+    def __init__(self, rate: float, capacity: int):
+        self.rate = rate
+        self.capacity = max(1, capacity)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def try_acquire(self) -> bool:
+        if self.rate <= 0:
+            return True
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return True
+            return False
+
+class GeminiRateLimited(Exception):
+    """Raised when a Gemini call is skipped because of the rate limit"""
+    pass
+
+class GeminiService:
+    """Runs Gemini calls off the request path with a deadline, rate limit and request coalescing.
+    
+    Calls run on a small dedicated thread pool. Identical prompts already in flight share
+    one call (singleflight), and callers stop waiting after `timeout` seconds while the
+    call itself completes in the background.
+    """
+    
+    def __init__(self, timeout: float, rate: float, burst: int, workers: int):
+        self.timeout = timeout
+        self.bucket = TokenBucket(rate, burst)
+        self.workers = max(1, workers)
+        self.executor = None
+        self.in_flight = {}
+        self.lock = threading.Lock()
+        self.counts = Counter()
+    
+    def start(self):
+        self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="gemini")
+    
+    def shutdown(self):
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
+    
+    def submit(self, prompt: str, gemini_model):
+        """Future for the Gemini text of a prompt, None when the service is not running,
+        or raise GeminiRateLimited"""
+        with self.lock:
+            if self.executor is None:
+                return None
+            future = self.in_flight.get(prompt)
+            if future is not None:
+                self.counts["coalesced"] += 1
+                return future
+            if not self.bucket.try_acquire():
+                self.counts["rate_limited"] += 1
+                raise GeminiRateLimited("Gemini rate limit reached")
+            
+            self.counts["calls"] += 1
+            future = self.executor.submit(generate_gemini_description, prompt, gemini_model)
+            self.in_flight[prompt] = future
+        future.add_done_callback(lambda _: self._finish(prompt))
+        return future
+    
+    def _finish(self, prompt: str):
+        with self.lock:
+            self.in_flight.pop(prompt, None)
+    
+    def wait(self, future) -> Tuple[Optional[str], bool]:
+        """Blocking wait (worker threads) for a submitted call: (text, timed_out).
+        
+        text is None when the call failed or missed the deadline; timed_out tells them apart.
+        """
+        try:
+            return future.result(timeout=self.timeout), False
+        except FutureTimeoutError:
+            self._count_timeout()
+            return None, True
+    
+    async def wait_async(self, future) -> Tuple[Optional[str], bool]:
+        """Event-loop wait for a submitted call: (text, timed_out), like wait()"""
+        try:
+            # shield() keeps the shared call alive when this waiter gives up
+            return await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(future)), self.timeout), False
+        except asyncio.TimeoutError:
+            self._count_timeout()
+            return None, True
+    
+    def _count_timeout(self):
+        with self.lock:
+            self.counts["timeouts"] += 1
+    
+    def stats(self) -> Dict:
+        with self.lock:
+            return {"timeout": self.timeout, "in_flight": len(self.in_flight), **self.counts}
+
+gemini_service = GeminiService(GEMINI_TIMEOUT, GEMINI_RATE_LIMIT, GEMINI_BURST, GEMINI_WORKERS)
+
+# --- Voice Description Cache ---
+
+def scene_signature(scene: SceneAnalysis) -> tuple:
+    """Normalized key of everything a voice description depends on.
+    
+    Label counts, traffic light colours, zebra crossings, the direction bucket of the
+    closest moving object, and the urgent hazard and safe-to-cross estimate from the
+    Gemini prompt - box jitter between frames does not change it, a car coming close does.
+    """
+    return (
+        tuple(sorted(Counter(scene.labels).items())),
+        tuple(sorted(Counter(scene.light_colors).items())),
+        scene.zebra_crossings,
+        scene.direction(scene.closest_moving()),
+        scene.urgent_hazard(),
+        scene.safe_to_cross
+    )
+
+class DescriptionCache:
+    """Thread-safe LRU cache with a TTL, mapping scene signatures to descriptions"""
+    
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+    
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0 and self.ttl > 0
+    
+    def get(self, key: tuple) -> Optional[str]:
+        if not self.enabled:
+            return None
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None and time.monotonic() - entry[1] < self.ttl:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self.entries[key]
+            self.misses += 1
+            return None
+    
+    def put(self, key: tuple, description: str):
+        if not self.enabled:
+            return
+        with self.lock:
+            self.entries[key] = (description, time.monotonic())
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+    
+    def stats(self) -> Dict:
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self.entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0
+            }
+
+description_cache = DescriptionCache(DESCRIPTION_CACHE_SIZE, DESCRIPTION_CACHE_TTL)
+
+def request_gemini_description(scene: SceneAnalysis, key: tuple):
+    """Start (or join) the Gemini call for a scene; its text is cached under `key` when it arrives.
+    
+    None when Gemini is not available; raises GeminiRateLimited when it is but the call was skipped.
+    """
+    if not model_manager.gemini_loaded:
+        return None
+    
+    future = gemini_service.submit(build_gemini_prompt(scene), model_manager.gemini_model)
+    if future is not None:
+        def cache_result(done):
+            if not done.cancelled() and done.exception() is None and done.result():
+                description_cache.put(key, done.result())
+        future.add_done_callback(cache_result)
+    return future
+
+def generate_voice_description(found: Detections, frame_width: Optional[int] = None, frame_height: Optional[int] = None) -> str:
+    """Voice description for a scene (blocking, for worker threads).
+    
+    Reused from the cache while the scene signature is unchanged; otherwise Gemini is
+    tried first and the template description is used if it misses the deadline, fails or
+    is rate limited.
+    """
+    with metrics.timer("describe"):
+        scene = SceneAnalysis(found, frame_width, frame_height)
+        key = scene_signature(scene)
+        description = description_cache.get(key)
+        if description is not None:
+            return description
+        
+        try:
+            future = request_gemini_description(scene, key)
+        except GeminiRateLimited:
+            # Gemini would answer this scene later - don't cache the template stand-in
+            return template_voice_description(scene)
+        if future is not None:
+            gemini_desc, timed_out = gemini_service.wait(future)
+            if gemini_desc:
+                return gemini_desc
+            if timed_out:
+                # Gemini is late - its answer is cached by the callback when it lands, so don't cache the template
+                return template_voice_description(scene)
+        
+        description = polish_description(template_voice_description(scene))
+        description_cache.put(key, description)
+        return description
+
+async def generate_voice_description_async(
+    found: Detections,
+    frame_width: Optional[int] = None,
+    frame_height: Optional[int] = None,
+    fast: bool = False
+) -> str:
+    """Voice description for a scene without blocking the event loop (same rules as generate_voice_description).
+    
+    fast=True (live mode) uses greedy, shorter Flan-T5 decoding when descriptions are polished.
+    """
+    description, _ = await describe_scene_async(found, frame_width, frame_height, fast)
+    return description
+
+async def describe_scene_async(
+    found: Detections,
+    frame_width: Optional[int] = None,
+    frame_height: Optional[int] = None,
+    fast: bool = False
+) -> Tuple[str, bool]:
+    """generate_voice_description_async plus whether the description is only the stand-in
+    template used because Gemini missed its deadline or was rate limited (callers shouldn't store it)"""
+    with metrics.timer("describe"):
+        scene = SceneAnalysis(found, frame_width, frame_height)
+        key = scene_signature(scene)
+        description = description_cache.get(key)
+        if description is not None:
+            return description, False
+        
+        try:
+            future = request_gemini_description(scene, key)
+        except GeminiRateLimited:
+            return template_voice_description(scene), True
+        if future is not None:
+            gemini_desc, timed_out = await gemini_service.wait_async(future)
+            if gemini_desc:
+                return gemini_desc, False
+            if timed_out:
+                return template_voice_description(scene), True
+        
+        description = await polish_description_async(template_voice_description(scene), fast)
+        description_cache.put(key, description)
+        return description, False
+
+def template_voice_description(scene: SceneAnalysis) -> str:
     """Generate natural language description for vision assistance with smart object categorization"""
     
-    # Try Gemini first (most natural)
-    if model_manager.gemini_loaded:
-        gemini_desc = generate_gemini_description(detections, model_manager.gemini_model)
-        if gemini_desc:
-            return gemini_desc
-    
-    # Separate objects by category
-    moving_objects = []
-    static_objects = []
-    traffic_lights = detections.get("traffic_lights", [])
-    zebra_crossings = detections.get("zebra_crossings", [])
-    
-    for obj in detections.get("objects", []):
-        label = obj.get("label", "unknown").lower()
-        if is_moving_object(label):
-            moving_objects.append(obj)
-        else:
-            static_objects.append(obj)
+    # Objects are already split into moving / static by the scene analysis
+    moving_labels = scene.moving_labels
+    static_labels = scene.static_labels
     
     # Build smart description
     description_parts = []
     
     # 1. Traffic Light Status (Infrastructure)
-    if traffic_lights:
-        colors = [d.get('color', d.get('label', '')).lower() for d in traffic_lights]
+    if scene.light_colors:
+        colors = scene.light_colors
         if 'red' in colors:
             description_parts.append("The traffic light is red")
         elif 'green' in colors:
@@ -753,8 +3393,8 @@ def generate_voice_description(detections: Dict, frame_width: Optional[int] = No
             description_parts.append("The traffic light is yellow")
     
     # 2. Moving Objects (Vehicles and Pedestrians) - these can "approach"
-    if moving_objects:
-        moving_counts = Counter([d.get("label", "object").lower() for d in moving_objects])
+    if moving_labels:
+        moving_counts = Counter(moving_labels)
         moving_list = []
         for name, count in moving_counts.most_common():
             if count == 1:
@@ -767,11 +3407,9 @@ def generate_voice_description(detections: Dict, frame_width: Optional[int] = No
         moving_summary = ", ".join(moving_list)
         
         # Add directional context for closest moving object
-        if frame_width:
-            closest_moving = max(moving_objects, key=lambda d: get_proximity(d.get("bbox", [0, 0, 0, 0])))
-            direction = get_direction(closest_moving.get("bbox", [0, 0, 0, 0]), frame_width)
-            
-            if len(moving_objects) == 1:
+        direction = scene.direction(scene.closest_moving())
+        if direction:
+            if len(moving_labels) == 1:
                 description_parts.append(f"There is {moving_summary} on your {direction}")
             else:
                 description_parts.append(f"There are {moving_summary} on the road, closest on your {direction}")
@@ -779,16 +3417,16 @@ def generate_voice_description(detections: Dict, frame_width: Optional[int] = No
             description_parts.append(f"There are {moving_summary} on the road")
     
     # 3. Zebra Crossings
-    if zebra_crossings:
-        count = len(zebra_crossings)
+    if scene.zebra_crossings:
+        count = scene.zebra_crossings
         if count == 1:
             description_parts.append("A zebra crossing is visible")
         else:
             description_parts.append(f"{count} zebra crossings are visible")
     
     # 4. Static Objects (Background context only)
-    if static_objects and len(static_objects) <= 3:  # Only mention if few items
-        static_counts = Counter([d.get("label", "object").lower() for d in static_objects])
+    if static_labels and len(static_labels) <= 3:  # Only mention if few items
+        static_counts = Counter(static_labels)
         static_list = []
         for name, count in static_counts.most_common(2):  # Max 2 types
             if count == 1:
@@ -800,9 +3438,9 @@ def generate_voice_description(detections: Dict, frame_width: Optional[int] = No
             description_parts.append(f"You can see {', '.join(static_list)} nearby")
     
     # 5. Safety Assessment
-    has_red_light = any(d.get('color', '').lower() == 'red' or d.get('label', '').lower() == 'red' for d in traffic_lights)
-    has_green_light = any(d.get('color', '').lower() == 'green' or d.get('label', '').lower() == 'green' for d in traffic_lights)
-    has_vehicles = any(obj.get('label', '').lower() in ['car', 'truck', 'bus', 'motorcycle'] for obj in moving_objects)
+    has_red_light = 'red' in scene.light_colors
+    has_green_light = 'green' in scene.light_colors
+    has_vehicles = scene.has_vehicles
     
     if has_red_light or has_vehicles:
         description_parts.append("Please wait before crossing")
@@ -4,6 +4,7 @@ Test script for MyVision API - Image and Video Detection
 import requests
 import base64
 import os
+import time
 
 API_URL = "http://localhost:8000"
 
@@ -17,10 +18,11 @@ def test_health():
     result = response.json()
     
     print(f"Status: {result['status']}")
-    print(f"Models loaded:")
-    for model, loaded in result['models'].items():
-        status = "✅" if loaded else "❌"
-        print(f"  {status} {model}")
+    print(f"Models:")
+    for model, info in result['models'].items():
+        status = {"ready": "✅", "failed": "❌"}.get(info['state'], "⏳")
+        load_time = f" ({info['load_seconds']}s)" if 'load_seconds' in info else ""
+        print(f"  {status} {model}: {info['state']}{load_time}")
     
     return result['status'] == 'healthy'
 
@@ -67,6 +69,39 @@ def test_image_detection(image_path: str, confidence: float = 0.5):
         print(f"❌ Error: {response.status_code}")
         print(response.json())
 
+def test_image_boxes_only(image_path: str, confidence: float = 0.5):
+    """Test image detection with annotate=false (boxes only, no annotated image)"""
+    if not os.path.exists(image_path):
+        print(f"❌ Image not found: {image_path}")
+        return
+    
+    print("\n" + "="*60)
+    print(f"📦 Testing Image Detection without annotation: {image_path}")
+    print("="*60)
+    
+    with open(image_path, 'rb') as f:
+        files = {'file': f}
+        params = {'confidence': confidence, 'annotate': 'false'}
+        
+        response = requests.post(f"{API_URL}/api/detect/image", files=files, params=params)
+    
+    if response.status_code == 200:
+        result = response.json()
+        
+        if 'annotated_image' in result:
+            print("❌ annotated_image returned although annotate=false")
+            return
+        
+        print(f"\n✅ Success! (cached: {result['cached']})")
+        print(f"  - Objects: {len(result['detections']['objects'])}")
+        print(f"  - Traffic lights: {len(result['detections']['traffic_lights'])}")
+        print(f"  - Zebra crossings: {len(result['detections']['zebra_crossings'])}")
+        for obj in result['detections']['objects'][:5]:
+            print(f"    - {obj['label']} ({obj['confidence']:.2f}) at {obj['bbox']}")
+    else:
+        print(f"❌ Error: {response.status_code}")
+        print(response.json())
+
 def test_video_detection(video_path: str, confidence: float = 0.4, sample_rate: int = 5):
     """Test video detection"""
     if not os.path.exists(video_path):
@@ -116,21 +151,101 @@ def test_video_detection(video_path: str, confidence: float = 0.4, sample_rate:
         print(f"\n🔊 Voice Description:")
         print(f"  {result['voice_description']}")
         
-        # Save annotated video
+        # Download annotated video (streamed from /api/videos/{video_id})
         if 'annotated_video' in result:
             output_path = f"annotated_{os.path.basename(video_path)}"
-            video_data = result['annotated_video'].split(',')[1]
-            video_bytes = base64.b64decode(video_data)
+            size = 0
             
-            with open(output_path, 'wb') as f:
-                f.write(video_bytes)
+            with requests.get(result['annotated_video'], stream=True) as download:
+                download.raise_for_status()
+                with open(output_path, 'wb') as f:
+                    for chunk in download.iter_content(chunk_size=1024 * 1024):
+                        f.write(chunk)
+                        size += len(chunk)
             
             print(f"\n💾 Annotated video saved: {output_path}")
-            print(f"   Size: {len(video_bytes) / 1024 / 1024:.2f} MB")
+            print(f"   Size: {size / 1024 / 1024:.2f} MB")
     else:
         print(f"❌ Error: {response.status_code}")
         print(response.json())
 
+def test_video_job(video_path: str, confidence: float = 0.4, sample_rate: int = 5):
+    """Test background video jobs: submit -> poll -> result -> annotated video download"""
+    if not os.path.exists(video_path):
+        print(f"❌ Video not found: {video_path}")
+        return
+    
+    print("\n" + "="*60)
+    print(f"🗂️ Testing Background Video Job: {video_path}")
+    print("="*60)
+    
+    with open(video_path, 'rb') as f:
+        files = {'file': f}
+        params = {'confidence': confidence, 'sample_rate': sample_rate}
+        
+        response = requests.post(f"{API_URL}/api/jobs/video", files=files, params=params, timeout=300)
+    
+    if response.status_code != 202:
+        print(f"❌ Error: {response.status_code}")
+        print(response.json())
+        return
+    
+    job = response.json()
+    print(f"📥 Job queued: {job['job_id']}")
+    
+    # Poll until the job has finished
+    while True:
+        status = requests.get(job['status_url']).json()
+        if status['state'] in ('completed', 'failed'):
+            break
+        if status['state'] == 'running' and status.get('total_frames'):
+            print(f"  ⏳ {status['frames_done']}/{status['total_frames']} frames, "
+                  f"{status['fps']} fps, ETA {status['eta_seconds']}s")
+        time.sleep(1)
+    
+    if status['state'] == 'failed':
+        print(f"❌ Job failed: {status.get('error')}")
+        return
+    
+    result = requests.get(job['result_url']).json()
+    print(f"\n✅ Job completed!")
+    print(f"  - Total frames: {result['video_info']['total_frames']}")
+    print(f"  - Processed frames: {result['video_info']['processed_frames']}")
+    print(f"  - Objects (last sample): {result['counts']['total_objects']}")
+    print(f"\n🔊 Voice Description:")
+    print(f"  {result['voice_description']}")
+    
+    if 'annotated_video' in result:
+        output_path = f"job_annotated_{os.path.basename(video_path)}"
+        size = 0
+        
+        with requests.get(result['annotated_video'], stream=True) as download:
+            download.raise_for_status()
+            with open(output_path, 'wb') as f:
+                for chunk in download.iter_content(chunk_size=1024 * 1024):
+                    f.write(chunk)
+                    size += len(chunk)
+        
+        print(f"\n💾 Annotated video saved: {output_path}")
+        print(f"   Size: {size / 1024 / 1024:.2f} MB")
+
+def test_metrics():
+    """Check the Prometheus /metrics endpoint"""
+    print("\n" + "="*60)
+    print("📈 Testing /metrics...")
+    print("="*60)
+    
+    response = requests.get(f"{API_URL}/metrics")
+    if response.status_code != 200:
+        print(f"❌ Error: {response.status_code}")
+        return False
+    
+    names = {line.split()[2] for line in response.text.splitlines() if line.startswith("# TYPE")}
+    for name in ("myvision_models_loaded", "myvision_inference_queue_depth"):
+        print(f"  {'✅' if name in names else '❌'} {name}")
+    print(f"  {len(names)} metrics exported")
+    return "myvision_models_loaded" in names
+
 def main():
     print("\n" + "="*60)
     print("🚀 MyVision API Test Suite")
@@ -149,9 +264,12 @@ def main():
     print("1. Test with your own image")
     print("2. Test with your own video")
     print("3. Run both tests")
+    print("4. Test image without annotation (boxes only)")
+    print("5. Test video as a background job")
+    print("6. Check /metrics")
     print("0. Exit")
     
-    choice = input("\nEnter your choice (0-3): ").strip()
+    choice = input("\nEnter your choice (0-6): ").strip()
     
     if choice == '1':
         image_path = input("Enter image path: ").strip()
@@ -174,6 +292,18 @@ def main():
         if os.path.exists(video_path):
             test_video_detection(video_path, 0.4, 5)
     
+    elif choice == '4':
+        image_path = input("Enter image path: ").strip()
+        test_image_boxes_only(image_path)
+    
+    elif choice == '5':
+        video_path = input("Enter video path: ").strip()
+        sample_rate = input("Enter sample rate (default 5, higher=faster): ").strip() or "5"
+        test_video_job(video_path, 0.4, int(sample_rate))
+    
+    elif choice == '6':
+        test_metrics()
+    
     elif choice == '0':
         print("\n👋 Goodbye!")
         return
@@ -33,7 +33,7 @@ interface DetectionResults {
   };
   voice_description: string;
   annotated_image?: string; // For images
-  annotated_video?: string; // For videos (base64)
+  annotated_video?: string; // For videos (URL of the streamed annotated video)
   video_info?: {
     total_frames: number;
     processed_frames: number;